@@ -18,7 +18,7 @@ class BrowserManager:
 
     async def initialize(self):
         """Initializes the Playwright browsers and populates the pool."""
-        logger.info(f"Initializing a pool of {self._pool_size} Playwright browsers (headless={self._headless}).")
+        logger.info("Initializing a pool of %s Playwright browsers (headless=%s).", self._pool_size, self._headless)
         self._playwright = await async_playwright().start()
         for _ in range(self._pool_size):
             browser = await self._playwright.chromium.launch(headless=self._headless)
@@ -1,10 +1,12 @@
 #mcp_servers\crawler_mcp\core\crawler.py
 import asyncio
 import logging
+import re
 from typing import Dict, Any, List
 from playwright.async_api import async_playwright, Page, expect
-from pydantic import BaseModel, HttpUrl
+from pydantic import BaseModel, ConfigDict, HttpUrl, TypeAdapter, ValidationError
 from datetime import datetime
+from urllib.parse import quote_plus
 from mcp_servers.crawler_mcp.core.browser_manager import BrowserManager
 from mcp_servers.crawler_mcp.core.strategies import smart_scroll_strategy, bfs_crawl_strategy, dfs_crawl_strategy
 
@@ -12,6 +14,8 @@ logger = logging.getLogger(__name__)
 
 class ExtractedPost(BaseModel):
     """Represents a single extracted social media post."""
+    model_config = ConfigDict(frozen=True, extra='ignore', str_strip_whitespace=True)
+
     text: str
     author: str
     timestamp: datetime
@@ -22,12 +26,30 @@ class ExtractedPost(BaseModel):
 
 class ExtractedProduct(BaseModel):
     """Represents a single extracted product from an e-commerce site."""
+    model_config = ConfigDict(frozen=True, extra='ignore', str_strip_whitespace=True)
+
     title: str
     price: float
     rating: float
     reviews: int
     product_url: HttpUrl
 
+
+# Built once so bulk validation reuses the compiled schema
+_posts_adapter = TypeAdapter(List[ExtractedPost])
+
+def _validate_posts(raw_posts: List[Dict[str, Any]]) -> List[ExtractedPost]:
+    """Validates the posts in one pass; invalid records are logged and skipped."""
+    try:
+        return _posts_adapter.validate_python(raw_posts)
+    except ValidationError as e:
+        invalid = {}
+        for error in e.errors():
+            invalid.setdefault(error["loc"][0], error["msg"])
+        for index, message in invalid.items():
+            logger.warning("Could not extract post data: post %s is invalid: %s", index, message)
+        return _posts_adapter.validate_python([post for index, post in enumerate(raw_posts) if index not in invalid])
+
 class ProductionCrawler:
     """
     A production-grade web crawler that uses Playwright for real-world scenarios.
@@ -50,23 +72,23 @@ class ProductionCrawler:
             # Implement "smart scroll" to load posts
             elements = await smart_scroll_strategy(page, scroll_limit=post_count // 5)
             
-            posts = []
+            raw_posts = []
             for element in elements[:post_count]:
                 # Complex extraction logic using selectors or LLM-guided extraction from Crawl4AI
                 try:
                     title_locator = element.locator(".post-title")
                     title = await title_locator.inner_text()
-                    posts.append(ExtractedPost(
-                        text=title,
-                        author="mock_author",
-                        timestamp=datetime.now(),
-                        engagement_metrics={"likes": 100, "shares": 20},
-                        source_url=url
-                    ))
+                    raw_posts.append({
+                        "text": title,
+                        "author": "mock_author",
+                        "timestamp": datetime.now(),
+                        "engagement_metrics": {"likes": 100, "shares": 20},
+                        "source_url": url
+                    })
                 except Exception as e:
-                    logger.warning(f"Could not extract post data: {e}")
+                    logger.warning("Could not extract post data: %s", e)
 
-            return posts
+            return _validate_posts(raw_posts)
 
         finally:
             await page.close()
@@ -128,7 +150,9 @@ class ProductionCrawler:
             await page.fill('input[name="q"]', query)
             await page.press('input[name="q"]', 'Enter')
             
-            await page.wait_for_url(lambda url: "search" in url.path and query in url.query_params["q"])
+            # A compiled pattern is matched natively by Playwright, no Python callback per navigation
+            search_url_pattern = re.compile(rf"/search.*[?&]q={re.escape(quote_plus(query))}(?:&|$)")
+            await page.wait_for_url(search_url_pattern)
             
             results = await page.locator(".search-result-title").all_inner_texts()
 
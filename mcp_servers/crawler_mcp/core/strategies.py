@@ -3,7 +3,7 @@ import asyncio
 from collections import deque
 from playwright.async_api import Page, Locator
 import logging
-from typing import Dict, Any, List
+from typing import Dict, Any, List, AsyncIterator
 
 logger = logging.getLogger(__name__)
 
@@ -43,6 +43,8 @@ async def bfs_crawl_strategy(page: Page, start_url: str, max_depth: int) -> List
         if depth > max_depth or url in visited_urls:
             continue
 
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("BFS visiting %s at depth %s", url, depth)
         try:
             await page.goto(url, wait_until="domcontentloaded")
             visited_urls.add(url)
@@ -56,38 +58,46 @@ async def bfs_crawl_strategy(page: Page, start_url: str, max_depth: int) -> List
                     if link.startswith(start_url) and link not in visited_urls:
                         queue.append((link, depth + 1))
         except Exception as e:
-            logger.error(f"Failed to crawl {url}: {e}")
+            logger.error("Failed to crawl %s: %s", url, e)
 
     return discovered_urls
 
 async def dfs_crawl_strategy(page: Page, start_url: str, max_depth: int) -> List[str]:
     """
     Performs a Depth-First Search to discover links.
+
+    Links are walked lazily through a recursive async generator, so only the
+    current path is held in memory instead of a stack of every pending link.
     """
     logger.info("Executing DFS crawl strategy...")
     visited_urls = set()
-    stack = [(start_url, 0)]
-    discovered_urls = []
 
-    while stack:
-        url, depth = stack.pop()
+    async def _dfs(url: str, depth: int) -> AsyncIterator[str]:
         if depth > max_depth or url in visited_urls:
-            continue
+            return
 
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("DFS visiting %s at depth %s", url, depth)
         try:
             await page.goto(url, wait_until="domcontentloaded")
             visited_urls.add(url)
-            discovered_urls.append(url)
-            
+            links = []
             if depth < max_depth:
                 links = await page.evaluate('''() => 
                     Array.from(document.querySelectorAll("a")).map(a => a.href)
                 ''')
-                # Push links to stack in reverse to get proper DFS order
-                for link in reversed(links):
-                    if link.startswith(start_url) and link not in visited_urls:
-                        stack.append((link, depth + 1))
         except Exception as e:
-            logger.error(f"Failed to crawl {url}: {e}")
+            logger.error("Failed to crawl %s: %s", url, e)
+            return
+
+        yield url
+        for link in links:
+            if link.startswith(start_url):
+                async for discovered_url in _dfs(link, depth + 1):
+                    yield discovered_url
 
-    return discovered_urls
\ No newline at end of file
+    discovered_urls = []
+    async for url in _dfs(start_url, 0):
+        discovered_urls.append(url)
+
+    return discovered_urls
@@ -21,7 +21,7 @@ def register_advanced_tools(mcp: FastMCP):
         :param query: The search term.
         :returns: A dictionary with the search results.
         """
-        logger.info(f"Advanced tool: perform_search called for {url} with query '{query}'")
+        logger.info("Advanced tool: perform_search called for %s with query '%s'", url, query)
         return await crawler.perform_search(url, query)
 
     @mcp.tool()
@@ -33,7 +33,7 @@ def register_advanced_tools(mcp: FastMCP):
         :param form_data: A dictionary of form field names and their values.
         :returns: A dictionary confirming the successful submission.
         """
-        logger.info(f"Advanced tool: interact_with_form called for {url}")
+        logger.info("Advanced tool: interact_with_form called for %s", url)
         return await crawler.interact_with_form(url, form_data)
 
     @mcp.tool()
@@ -46,5 +46,5 @@ def register_advanced_tools(mcp: FastMCP):
         :param js_code: The JavaScript code as a string.
         :returns: A dictionary with the result of the JavaScript execution.
         """
-        logger.info(f"Advanced tool: execute_js_snippet called for {url}")
+        logger.info("Advanced tool: execute_js_snippet called for %s", url)
         return await crawler.execute_js_snippet(url, js_code)
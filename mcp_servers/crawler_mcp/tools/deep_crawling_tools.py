@@ -20,7 +20,7 @@ def register_deep_crawling_tools(mcp: FastMCP):
         :param max_depth: The maximum link depth to explore.
         :returns: A list of discovered URLs.
         """
-        logger.info(f"Deep crawling tool: bfs_crawl called for {start_url}")
+        logger.info("Deep crawling tool: bfs_crawl called for %s", start_url)
         return await crawler.bfs_crawl(start_url, max_depth)
 
     @mcp.tool()
@@ -32,7 +32,7 @@ def register_deep_crawling_tools(mcp: FastMCP):
         :param max_depth: The maximum link depth to explore.
         :returns: A list of discovered URLs.
         """
-        logger.info(f"Deep crawling tool: dfs_crawl called for {start_url}")
+        logger.info("Deep crawling tool: dfs_crawl called for %s", start_url)
         return await crawler.dfs_crawl(start_url, max_depth)
 
     @mcp.tool()
@@ -44,5 +44,5 @@ def register_deep_crawling_tools(mcp: FastMCP):
         :param scroll_limit: The number of times to simulate scrolling.
         :returns: A list of extracted content after scrolling.
         """
-        logger.info(f"Deep crawling tool: smart_scroll_and_crawl called for {url}")
+        logger.info("Deep crawling tool: smart_scroll_and_crawl called for %s", url)
         return await crawler.smart_scroll_and_crawl(url, scroll_limit)
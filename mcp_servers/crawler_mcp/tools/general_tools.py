@@ -19,7 +19,7 @@ def register_general_tools(mcp: FastMCP):
         :param url: The URL of the page to crawl.
         :returns: A structured ExtractedPost object.
         """
-        logger.info(f"General tool: crawl_and_extract called for {url}")
+        logger.info("General tool: crawl_and_extract called for %s", url)
         # This function is now a high-level tool that uses other more specific crawlers
         # We'll use the social media crawler as a generic example here
         posts = await crawler.crawl_social_media_posts(url, 1)
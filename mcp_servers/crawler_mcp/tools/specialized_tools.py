@@ -21,7 +21,7 @@ def register_specialized_tools(mcp: FastMCP):
         :param post_count: The number of posts to retrieve.
         :returns: A list of structured ExtractedPost objects.
         """
-        logger.info(f"Specialized tool: crawl_social_media_posts called for {url}")
+        logger.info("Specialized tool: crawl_social_media_posts called for %s", url)
         return await crawler.crawl_social_media_posts(url, post_count)
 
     @mcp.tool()
@@ -33,7 +33,7 @@ def register_specialized_tools(mcp: FastMCP):
         :param url: The URL of the product page.
         :returns: A structured ExtractedProduct object.
         """
-        logger.info(f"Specialized tool: extract_product_info called for {url}")
+        logger.info("Specialized tool: extract_product_info called for %s", url)
         return await crawler.extract_product_info(url)
 
     @mcp.tool()
@@ -45,5 +45,5 @@ def register_specialized_tools(mcp: FastMCP):
         :param post_id: The ID of the post to extract comments from.
         :returns: A list of dictionaries, each representing a comment.
         """
-        logger.info(f"Specialized tool: extract_comments called for {url} and post ID {post_id}")
+        logger.info("Specialized tool: extract_comments called for %s and post ID %s", url, post_id)
         return await crawler.extract_comments(url, post_id)
@@ -1,7 +1,11 @@
 import logging
-from fastapi import FastAPI
+import os
+import sys
+from fastapi import FastAPI, Response
 from fastmcp import FastMCP
 from dotenv import load_dotenv
+from contextlib import asynccontextmanager
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 
 # Import the new SocialManager class
 from mcp_servers.social_mcp.core.social_manager import SocialManager
@@ -24,10 +28,41 @@ social_manager.register_social_tools()
 
 # Mount the MCP server
 http_mcp = mcp.http_app(transport="streamable-http")
-app = FastAPI(lifespan=http_mcp.router.lifespan_context)
-app.mount("/", http_mcp)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Runs the MCP lifespan, warming up the social clients on startup and releasing them on shutdown."""
+    async with http_mcp.router.lifespan_context(app):
+        await social_manager.start()
+        yield
+    logger.info("Closing social media clients on shutdown.")
+    await social_manager.close()
+
+app = FastAPI(lifespan=lifespan)
+
+# An exact route: Mount("/metrics") only matches /metrics/..., so scrapes of
+# /metrics would fall through to the MCP mount
+@app.get("/metrics", include_in_schema=False)
+def metrics() -> Response:
+    """Serves the Prometheus metrics of this process."""
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
 
 @app.get("/health")
 async def health_check():
     """A simple health check endpoint."""
     return {"status": "ok", "service": "social_mcp"}
+
+# The catch-all MCP mount goes last so the routes above are matched first
+app.mount("/", http_mcp)
+
+if __name__ == "__main__":
+    import uvicorn
+
+    # Every tool is network-bound, so serve on uvloop (not available on Windows).
+    # 9006 is where the agent's MCP config expects the social server.
+    uvicorn.run(
+        app,
+        host="0.0.0.0",
+        port=int(os.getenv("SOCIAL_MCP_PORT", "9006")),
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+    )
@@ -0,0 +1,18 @@
+import asyncio
+from weakref import WeakValueDictionary
+
+class KeyedLocks:
+    """
+    Hands out one asyncio.Lock per cache key, so concurrent misses on the same
+    key trigger a single fetch. A lock is dropped once nothing holds or waits on it.
+    """
+    def __init__(self):
+        self._locks: "WeakValueDictionary[str, asyncio.Lock]" = WeakValueDictionary()
+
+    def __call__(self, key: str) -> asyncio.Lock:
+        """Returns the lock for a cache key."""
+        lock = self._locks.get(key)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._locks[key] = lock
+        return lock
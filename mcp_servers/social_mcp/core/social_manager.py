@@ -1,8 +1,10 @@
+import asyncio
 import logging
+import os
 from fastmcp import FastMCP
-from mcp_servers.social_mcp.tools.reddit_tools import register_reddit_tools
-from mcp_servers.social_mcp.tools.tiktok_tools import register_tiktok_tools
-from mcp_servers.social_mcp.tools.twitter_tools import register_twitter_tools
+from mcp_servers.social_mcp.tools.reddit_tools import register_reddit_tools, close_reddit_client
+from mcp_servers.social_mcp.tools.tiktok_tools import register_tiktok_tools, TikTokClient
+from mcp_servers.social_mcp.tools.twitter_tools import register_twitter_tools, close_twitter_client
 
 logger = logging.getLogger(__name__)
 
@@ -14,39 +16,69 @@ class SocialManager:
     the Reddit, TikTok, and Twitter toolsets, making the main application file
     cleaner and more organized.
     """
+    # (platform, registration function) pairs, registered in this order
+    _TOOL_REGISTRARS = (
+        ("Reddit", register_reddit_tools),
+        ("TikTok", register_tiktok_tools),
+        ("Twitter", register_twitter_tools),
+    )
+
     def __init__(self, mcp_instance: FastMCP):
         self.mcp_instance = mcp_instance
+        self._warm_up_task = None
 
     def register_social_tools(self):
         """
         Registers all available social media tools with the FastMCP instance.
         
-        Each tool registration is wrapped in a try/except block to ensure
+        Each platform's registration is wrapped in a try/except block to ensure
         that a failure in one tool (e.g., due to missing API keys) does not
         prevent the other tools from being loaded and the server from running.
         """
         logger.info("Starting tool registration for Social MCP.")
-        
-        # Register Reddit tools
+
+        for platform, register_tools in self._TOOL_REGISTRARS:
+            try:
+                register_tools(self.mcp_instance)
+                logger.info("Successfully registered %s tools.", platform)
+            except Exception as e:
+                logger.exception("Failed to register %s tools: %s", platform, e)
+
+        logger.info("Tool registration complete.")
+
+    async def start(self):
+        """
+        Prepares the social media clients in the background at server startup.
+        The TikTok browser sessions take seconds to start, so they are warmed up
+        here instead of on the first tool call. Set TIKTOK_PREWARM=false to skip.
+        """
+        if os.getenv("TIKTOK_PREWARM", "true").lower() in ("1", "true", "yes"):
+            self._warm_up_task = asyncio.create_task(self._warm_up_tiktok())
+
+    async def _warm_up_tiktok(self):
         try:
-            register_reddit_tools(self.mcp_instance)
-            logger.info("Successfully registered Reddit tools.")
+            await TikTokClient.warm_up()
+            logger.info("TikTok client warmed up.")
         except Exception as e:
-            logger.error(f"Failed to register Reddit tools: {e}")
+            # The first tool call will retry the initialization
+            logger.exception("Failed to warm up TikTok client: %s", e)
 
-        # Register TikTok tools
+    async def close(self):
+        """
+        Releases the network resources held by the social media clients.
+        Called once when the MCP server shuts down.
+        """
+        if self._warm_up_task is not None and not self._warm_up_task.done():
+            self._warm_up_task.cancel()
         try:
-            register_tiktok_tools(self.mcp_instance)
-            logger.info("Successfully registered TikTok tools.")
+            await close_reddit_client()
         except Exception as e:
-            logger.error(f"Failed to register TikTok tools: {e}")
-            
-        # Register Twitter tools
+            logger.exception("Failed to close Reddit client: %s", e)
         try:
-            register_twitter_tools(self.mcp_instance)
-            logger.info("Successfully registered Twitter tools.")
+            await TikTokClient.close()
         except Exception as e:
-            logger.error(f"Failed to register Twitter tools: {e}")
-            
-        logger.info("Tool registration complete.")
-
+            logger.exception("Failed to close TikTok client: %s", e)
+        try:
+            await close_twitter_client()
+        except Exception as e:
+            logger.exception("Failed to close Twitter client: %s", e)
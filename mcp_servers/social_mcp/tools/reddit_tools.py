@@ -1,96 +1,192 @@
 import os
+import re
+import time
+import asyncio
 import logging
-from typing import Dict, Any, List
-from pydantic import BaseModel, HttpUrl, Field
-import praw
-from praw.exceptions import RedditAPIException
+import math
+import functools
+from typing import Dict, Any, List, Awaitable, Optional, TypeVar
+import aiohttp
+import httpx
+from cachetools import TTLCache
+from pydantic import BaseModel, Field
+import asyncpraw
+from asyncpraw.exceptions import RedditAPIException
 from fastmcp import FastMCP
 from dotenv import load_dotenv
 
+from mcp_servers.social_mcp.core.cache_locks import KeyedLocks
+
 load_dotenv()
 
 # --- Logging Setup ---
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-# --- PRAW Client Encapsulation ---
+T = TypeVar("T")
+
+# --- Rate Limiting ---
+class RedditRateLimiter:
+    """
+    A token bucket shared by every Reddit tool so bursts of MCP calls stay
+    under Reddit's quota instead of running into 429s.
+
+    The bucket refills at `rate_limit` requests per `period` seconds and is
+    corrected from the quota Reddit reports after each response.
+    """
+    def __init__(self, rate_limit: int = 60, period: float = 60.0):
+        self._capacity = rate_limit
+        self._refill_rate = rate_limit / period
+        self._tokens = float(rate_limit)
+        self._updated_at = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self._capacity, self._tokens + (now - self._updated_at) * self._refill_rate)
+        self._updated_at = now
+
+    async def acquire(self, tokens: int = 1):
+        """Waits until `tokens` requests may be sent and consumes that many tokens."""
+        # More than a full bucket could never be granted; the excess waits on Reddit's own limit
+        tokens = min(tokens, self._capacity)
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._blocked_until:
+                    await asyncio.sleep(self._blocked_until - now)
+                    continue
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                await asyncio.sleep((tokens - self._tokens) / self._refill_rate)
+
+    def update(self, remaining: Optional[float], reset_in: Optional[float]):
+        """Aligns the bucket with the X-Ratelimit-Remaining / X-Ratelimit-Reset values."""
+        if remaining is None:
+            return
+        self._refill()
+        self._tokens = min(self._tokens, remaining)
+        if remaining < 1 and reset_in:
+            self._blocked_until = time.monotonic() + reset_in
+
+# --- Async PRAW Client Encapsulation ---
+REDDIT_ENV_VARS = (
+    "REDDIT_CLIENT_ID",
+    "REDDIT_CLIENT_SECRET",
+    "REDDIT_USER_AGENT",
+    "REDDIT_USERNAME",
+    "REDDIT_PASSWORD",
+)
+
 class RedditClient:
     """
-    Manages the PRAW client, ensuring it's initialized with environment variables.
+    Manages the Async PRAW client, ensuring it's initialized with environment variables.
     Encapsulating the client allows for cleaner dependency management.
+
+    Every request goes through one aiohttp session and connector, so TCP/TLS
+    connections are reused across tool calls and outbound sockets stay capped.
     """
     def __init__(self):
-        self._reddit = self._initialize_client()
+        self._credentials = self._load_credentials()
+        self._reddit = None
+        self._session = None
+        self._rate_limiter = RedditRateLimiter(rate_limit=60, period=60)
 
-    def _initialize_client(self):
-        """Initializes the PRAW client from environment variables with detailed logging."""
+    async def call(self, awaitable: Awaitable[T], requests: int = 1) -> T:
+        """
+        Runs a Reddit request through the shared rate limiter.
+        :param requests: How many HTTP requests the awaitable makes, e.g. `_pages(limit)` for a drained listing.
+        """
+        await self._rate_limiter.acquire(requests)
         try:
-            # Log the start of the environment variable check
-            logger.info("Attempting to load Reddit API environment variables...")
-
-            client_id = os.getenv("REDDIT_CLIENT_ID")
-            logger.debug(f"REDDIT_CLIENT_ID: {'Found' if client_id else 'Missing'}")
-
-            client_secret = os.getenv("REDDIT_CLIENT_SECRET")
-            logger.debug(f"REDDIT_CLIENT_SECRET: {'Found' if client_secret else 'Missing'}")
-
-            user_agent = os.getenv("REDDIT_USER_AGENT")
-            logger.debug(f"REDDIT_USER_AGENT: {'Found' if user_agent else 'Missing'}")
-            
-            username = os.getenv("REDDIT_USERNAME")
-            logger.debug(f"REDDIT_USERNAME: {'Found' if username else 'Missing'}")
-            
-            password = os.getenv("REDDIT_PASSWORD")
-            logger.debug(f"REDDIT_PASSWORD: {'Found' if password else 'Missing'}")
-
-            if not all([client_id, client_secret, user_agent, username, password]):
-                # Log a more specific error message when variables are missing
-                missing_vars = [
-                    name for name, val in {
-                        "REDDIT_CLIENT_ID": client_id,
-                        "REDDIT_CLIENT_SECRET": client_secret,
-                        "REDDIT_USER_AGENT": user_agent,
-                        "REDDIT_USERNAME": username,
-                        "REDDIT_PASSWORD": password
-                    }.items() if not val
-                ]
-                error_msg = f"Missing required Reddit API environment variables: {', '.join(missing_vars)}"
-                logger.error(error_msg)
-                raise ValueError(error_msg)
-
-            logger.info("All required Reddit API environment variables found. Initializing PRAW client...")
-            
-            # Use await praw.Reddit for async operations
-            return praw.Reddit(
-                client_id=client_id,
-                client_secret=client_secret,
-                user_agent=user_agent,
-                username=username,
-                password=password
-            )
-        except Exception as e:
-            # The catch-all is still useful for unexpected errors, but the
-            # specific `ValueError` should now provide a clearer message.
-            logger.error(f"Failed to initialize PRAW client: {e}")
+            return await awaitable
+        finally:
+            self._sync_rate_limit()
+
+    def _sync_rate_limit(self):
+        """Feeds the quota parsed by asyncprawcore from the last response headers into the limiter."""
+        core_limiter = getattr(getattr(self._reddit, "_core", None), "_rate_limiter", None)
+        remaining = getattr(core_limiter, "remaining", None)
+        reset_timestamp = getattr(core_limiter, "reset_timestamp", None)
+        reset_in = max(reset_timestamp - time.time(), 0) if reset_timestamp else None
+        self._rate_limiter.update(remaining, reset_in)
+
+    def _load_credentials(self) -> Optional[Dict[str, str]]:
+        """Reads the Reddit API credentials from environment variables with detailed logging."""
+        # Log the start of the environment variable check
+        logger.info("Attempting to load Reddit API environment variables...")
+
+        # Single pass over the env vars; the kwarg names are derived from the var names
+        creds = {name: os.getenv(name) for name in REDDIT_ENV_VARS}
+        missing_vars = [name for name, value in creds.items() if not value]
+        logger.debug("Reddit API environment variables found: %s", [name for name, value in creds.items() if value])
+
+        if missing_vars:
+            logger.error("Missing required Reddit API environment variables: %s", ", ".join(missing_vars))
             return None
-    
+
+        logger.info("All required Reddit API environment variables found.")
+        return {name.removeprefix("REDDIT_").lower(): value for name, value in creds.items()}
+
+    def _initialize_client(self):
+        """
+        Initializes the Async PRAW client on a shared aiohttp session.
+        aiohttp sessions must be created inside the running event loop, so this
+        runs on first use from a tool rather than at startup.
+        """
+        logger.info("Initializing Async PRAW client...")
+        connector = aiohttp.TCPConnector(limit=1024, limit_per_host=64, ttl_dns_cache=300)
+        self._session = aiohttp.ClientSession(connector=connector)
+        # asyncpraw keeps every request on the event loop instead of blocking it
+        return asyncpraw.Reddit(requestor_kwargs={"session": self._session}, **self._credentials)
+
+    @property
+    def is_configured(self) -> bool:
+        """True when all required credentials are present."""
+        return self._credentials is not None
+
     @property
     def client(self):
-        """Returns the initialized PRAW client."""
-        if self._reddit is None:
+        """Returns the Async PRAW client, creating it on first access."""
+        if not self.is_configured:
             raise RuntimeError("Reddit client is not initialized. Check logs for API key errors.")
+        if self._reddit is None:
+            self._reddit = self._initialize_client()
         return self._reddit
 
-# Initialize the client globally for the module
-try:
-    reddit_manager = RedditClient()
-    reddit_client = reddit_manager.client
-except (ValueError, RuntimeError) as e:
-    # This log is a good final check to see if the module failed to load.
-    logger.error(f"Application cannot start without a working Reddit client: {e}")
-    reddit_client = None  # Explicitly set to None if initialization fails
+    async def close(self):
+        """Closes the Async PRAW client and its shared HTTP session."""
+        if self._reddit is not None:
+            await self._reddit.close()
+            self._reddit = None
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+            logger.info("Reddit HTTP session has been closed.")
+
+@functools.lru_cache(maxsize=1)
+def get_reddit_manager() -> RedditClient:
+    """
+    Returns the shared RedditClient, building it on first use.
+    Deferring construction keeps this module importable without Reddit credentials.
+    """
+    return RedditClient()
+
+async def close_reddit_client():
+    """Releases the shared Reddit and Pushshift sessions. Called on MCP server shutdown."""
+    global _pushshift_client
+    if get_reddit_manager.cache_info().currsize:
+        await get_reddit_manager().close()
+    if _pushshift_client is not None:
+        await _pushshift_client.aclose()
+        _pushshift_client = None
 
 # --- Data Models for Input and Output ---
+# These document the shape of each tool's result. The tools return plain dicts
+# in the same shape rather than validating data that comes straight from Reddit.
 class UserDetails(BaseModel):
     name: str
     karma: int
@@ -104,7 +200,7 @@ class PostDetails(BaseModel):
     num_comments: int
     author: str
     created_utc: float
-    url: HttpUrl
+    url: str = Field(..., pattern=r"^https?://")
 
 class SubredditStats(BaseModel):
     name: str
@@ -114,22 +210,166 @@ class SubredditStats(BaseModel):
 class StrategicPost(BaseModel):
     id: str
     title: str
-    url: HttpUrl
+    url: str = Field(..., pattern=r"^https?://")
 
 class ReplyResponse(BaseModel):
     status: str
     comment_id: str = Field(..., description="The ID of the newly created comment.")
 
+# --- Response Caching ---
+# Subscriber counts and the popular listing change over minutes, so repeated
+# lookups within a session are served from memory.
+_stats_cache: TTLCache = TTLCache(maxsize=1024, ttl=120)
+_trending_cache: TTLCache = TTLCache(maxsize=1, ttl=120)
+_TRENDING_CACHE_KEY = "popular"
+_cache_lock = KeyedLocks()
+
+async def _collect(listing) -> List[Any]:
+    """Drains an asyncpraw listing so it can be throttled as one `call`."""
+    return [item async for item in listing]
+
+# Reddit listings return at most 100 items per request
+_LISTING_PAGE_SIZE = 100
+
+def _pages(limit: int) -> int:
+    """The number of requests asyncpraw makes to drain a listing of `limit` items."""
+    return max(1, math.ceil(limit / _LISTING_PAGE_SIZE))
+
+# Keyword patterns for get_ai_insights. Case-insensitive substring matches, so
+# "trending" still counts as "trend", without lowercasing a copy of the text.
+_VIRAL_RE = re.compile(r"viral|trend", re.IGNORECASE)
+_NEGATIVE_RE = re.compile(r"problem|issue", re.IGNORECASE)
+
+# Upper bound on in-flight subreddit fetches for a single batch call
+_MAX_CONCURRENT_FETCHES = 64
+
+async def _fetch_subreddit_posts(subreddit_name: str, post_count: int) -> List[Dict[str, Any]]:
+    """Fetches the top posts of one subreddit. Shared by the single and batch tools."""
+    reddit = get_reddit_manager()
+    subreddit = await reddit.client.subreddit(subreddit_name)
+    top_posts = await reddit.call(_collect(subreddit.top(limit=post_count)), _pages(post_count))
+    return [_post_to_dict(post) for post in top_posts]
+
+async def _fetch_subreddit_posts_page(subreddit_name: str, after: Optional[str], page_size: int) -> Dict[str, Any]:
+    """Fetches one page of top posts, starting after the given post fullname."""
+    reddit = get_reddit_manager()
+    subreddit = await reddit.client.subreddit(subreddit_name)
+    params = {"after": after} if after else None
+    top_posts = await reddit.call(_collect(subreddit.top(limit=page_size, params=params)), _pages(page_size))
+    # A short page means the listing is exhausted
+    next_after = top_posts[-1].fullname if len(top_posts) == page_size else None
+    return {"posts": [_post_to_dict(post) for post in top_posts], "after": next_after}
+
+def _post_to_dict(post) -> Dict[str, Any]:
+    """Converts a submission to a dict in the PostDetails shape, without validating it through the model."""
+    return {
+        "id": post.id,
+        "title": post.title,
+        "score": post.score,
+        "num_comments": post.num_comments,
+        # str() reads the name the listing already returned; never triggers a Redditor fetch
+        "author": str(post.author) if post.author else "[deleted]",
+        "created_utc": post.created_utc,
+        "url": post.url,
+    }
+
+# --- Historical Retrieval ---
+# Reddit listings can't be filtered by date, so time-ranged queries go through
+# a Pushshift-compatible search endpoint and are optionally hydrated via Reddit.
+PUSHSHIFT_SUBMISSION_URL = os.getenv("PUSHSHIFT_SUBMISSION_URL", "https://api.pushshift.io/reddit/search/submission")
+_PUSHSHIFT_PAGE_SIZE = 500
+_INFO_BATCH_SIZE = 100
+_pushshift_client: Optional[httpx.AsyncClient] = None
+
+def _get_pushshift_client() -> httpx.AsyncClient:
+    """Returns the shared Pushshift client, so range queries reuse its connections."""
+    global _pushshift_client
+    if _pushshift_client is None or _pushshift_client.is_closed:
+        _pushshift_client = httpx.AsyncClient(timeout=30)
+    return _pushshift_client
+
+async def _fetch_pushshift_range(subreddit_name: str, after_utc: int, before_utc: int, max_posts: int) -> List[Dict[str, Any]]:
+    """
+    Pages backwards through a time range, sliding `before` to just past the
+    oldest post of each page. Posts sharing that second may not all have fit
+    on the page, so it is requested again and repeats are dropped by id.
+    """
+    posts = []
+    seen = set()
+    before = before_utc
+    overlap = 0  # Posts of the previous page that the next one returns again
+    http = _get_pushshift_client()
+    while len(posts) < max_posts:
+        response = await http.get(PUSHSHIFT_SUBMISSION_URL, params={
+            "subreddit": subreddit_name,
+            "after": after_utc,
+            "before": before,
+            "size": min(_PUSHSHIFT_PAGE_SIZE, max_posts - len(posts) + overlap),
+            "sort": "desc",
+            "sort_type": "created_utc",
+        })
+        response.raise_for_status()
+        page = response.json().get("data", [])
+        if not page:
+            break
+        new_posts = [item for item in page if item["id"] not in seen]
+        for item in new_posts:
+            seen.add(item["id"])
+            posts.append({"id": item["id"], "title": item.get("title"), "created_utc": item.get("created_utc")})
+        oldest = int(min(item["created_utc"] for item in page))
+        if oldest <= after_utc:
+            break
+        if new_posts:
+            overlap = sum(1 for item in page if int(item["created_utc"]) == oldest)
+            before = oldest + 1
+        else:
+            # A whole page of repeats: more posts share that second than fit
+            # on one page, so step past it rather than re-request it forever
+            overlap = 0
+            before = oldest
+    return posts[:max_posts]
+
+async def _hydrate_posts(post_ids: List[str]) -> List[Dict[str, Any]]:
+    """Loads full submissions from Reddit, 100 fullnames per request."""
+    reddit = get_reddit_manager()
+    submissions = []
+    for start in range(0, len(post_ids), _INFO_BATCH_SIZE):
+        fullnames = [f"t3_{post_id}" for post_id in post_ids[start:start + _INFO_BATCH_SIZE]]
+        submissions.extend(await reddit.call(_collect(reddit.client.info(fullnames=fullnames))))
+    return [_post_to_dict(submission) for submission in submissions]
+
+def reddit_tool(api_error: str = "Reddit API error"):
+    """
+    Wraps a tool coroutine with the shared error handling, so Reddit API and
+    unexpected errors are logged and returned as error dicts in one place.
+
+    :param api_error: The error label returned when Reddit rejects the request.
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            try:
+                return await fn(*args, **kwargs)
+            except RedditAPIException as e:
+                logger.error("Reddit API error in %s: %s", fn.__name__, e)
+                return {"error": api_error, "message": str(e)}
+            except Exception as e:
+                logger.exception("Unexpected error in %s", fn.__name__)
+                return {"error": "Internal server error", "message": str(e)}
+        return wrapper
+    return decorator
+
 # --- Tool Registration ---
 def register_reddit_tools(mcp: FastMCP):
     """
     Registers all Reddit-related tools with the FastMCP instance.
     """
-    if not reddit_client:
-        logger.warning("Skipping Reddit tool registration due to PRAW client initialization failure.")
+    if not get_reddit_manager().is_configured:
+        logger.warning("Skipping Reddit tool registration due to missing Reddit API credentials.")
         return
 
     @mcp.tool()
+    @reddit_tool()
     async def get_user_details(username: str) -> Dict[str, Any]:
         """
         Retrieves detailed information about a specific Reddit user.
@@ -138,22 +378,17 @@ def register_reddit_tools(mcp: FastMCP):
         :returns: A dictionary containing the user's name, karma, and other details.
         """
         logger.info(f"Tool 'get_user_details' called for username: {username}")
-        try:
-            redditor = await reddit_client.redditor(username)
-            return UserDetails(
-                name=redditor.name,
-                karma=redditor.link_karma + redditor.comment_karma,
-                created_utc=redditor.created_utc,
-                is_gold=redditor.is_gold
-            ).model_dump()
-        except RedditAPIException as e:
-            logger.error(f"Reddit API error for get_user_details: {e}")
-            return {"error": "Reddit API error", "message": str(e)}
-        except Exception as e:
-            logger.error(f"Unexpected error in get_user_details: {e}")
-            return {"error": "Internal server error", "message": str(e)}
+        reddit = get_reddit_manager()
+        redditor = await reddit.call(reddit.client.redditor(username, fetch=True))
+        return {
+            "name": redditor.name,
+            "karma": redditor.link_karma + redditor.comment_karma,
+            "created_utc": redditor.created_utc,
+            "is_gold": redditor.is_gold,
+        }
 
     @mcp.tool()
+    @reddit_tool(api_error="Subreddit not found or invalid")
     async def fetch_subreddit_posts(subreddit_name: str, post_count: int = 10) -> List[Dict[str, Any]]:
         """
         Fetches the top posts from a specified subreddit.
@@ -163,28 +398,85 @@ def register_reddit_tools(mcp: FastMCP):
         :returns: A list of dictionaries, each representing a post.
         """
         logger.info(f"Tool 'fetch_subreddit_posts' called for r/{subreddit_name}, count: {post_count}")
-        try:
-            subreddit = await reddit_client.subreddit(subreddit_name)
-            posts = [
-                PostDetails(
-                    id=post.id,
-                    title=post.title,
-                    score=post.score,
-                    num_comments=post.num_comments,
-                    author=post.author.name if post.author else "[deleted]",
-                    created_utc=post.created_utc,
-                    url=post.url
-                ).model_dump() for post in subreddit.top(limit=post_count)
-            ]
-            return posts
-        except RedditAPIException as e:
-            logger.error(f"Reddit API error for fetch_subreddit_posts: {e}")
-            return {"error": "Subreddit not found or invalid"}
-        except Exception as e:
-            logger.error(f"Unexpected error in fetch_subreddit_posts: {e}")
-            return {"error": "Internal server error", "message": str(e)}
+        return await _fetch_subreddit_posts(subreddit_name, post_count)
+
+    @mcp.tool()
+    @reddit_tool(api_error="Subreddit not found or invalid")
+    async def fetch_subreddit_posts_page(
+        subreddit_name: str,
+        after: Optional[str] = None,
+        page_size: int = 25
+    ) -> Dict[str, Any]:
+        """
+        Fetches one page of top posts from a subreddit, so large result sets can be pulled incrementally.
+        
+        :param subreddit_name: The name of the subreddit (e.g., 'technology').
+        :param after: The cursor returned by the previous page. Omit for the first page.
+        :param page_size: The number of posts per page (max 100). Defaults to 25.
+        :returns: A dictionary with the page's `posts` and the `after` cursor for the next page, or None when done.
+        """
+        logger.info(f"Tool 'fetch_subreddit_posts_page' called for r/{subreddit_name}, after: {after}")
+        return await _fetch_subreddit_posts_page(subreddit_name, after, min(page_size, 100))
 
     @mcp.tool()
+    async def fetch_many_subreddits(subreddit_names: List[str], post_count: int = 10) -> Dict[str, Any]:
+        """
+        Fetches the top posts from several subreddits concurrently.
+        
+        :param subreddit_names: The names of the subreddits (e.g., ['technology', 'science']).
+        :param post_count: The number of top posts to retrieve per subreddit. Defaults to 10.
+        :returns: A dictionary mapping each subreddit name to its list of posts, or to an error.
+        """
+        logger.info(f"Tool 'fetch_many_subreddits' called for {len(subreddit_names)} subreddits, count: {post_count}")
+        semaphore = asyncio.Semaphore(_MAX_CONCURRENT_FETCHES)
+
+        async def fetch_one(subreddit_name: str) -> List[Dict[str, Any]]:
+            async with semaphore:
+                return await _fetch_subreddit_posts(subreddit_name, post_count)
+
+        results = await asyncio.gather(*(fetch_one(name) for name in subreddit_names), return_exceptions=True)
+
+        # One failing subreddit must not discard the others
+        batch = {}
+        for subreddit_name, result in zip(subreddit_names, results):
+            if isinstance(result, RedditAPIException):
+                logger.error(f"Reddit API error for r/{subreddit_name} in fetch_many_subreddits: {result}")
+                batch[subreddit_name] = {"error": "Subreddit not found or invalid"}
+            elif isinstance(result, Exception):
+                logger.error(f"Unexpected error for r/{subreddit_name} in fetch_many_subreddits: {result}")
+                batch[subreddit_name] = {"error": "Internal server error", "message": str(result)}
+            else:
+                batch[subreddit_name] = result
+        return batch
+
+    @mcp.tool()
+    @reddit_tool()
+    async def fetch_posts_in_range(
+        subreddit_name: str,
+        after_utc: int,
+        before_utc: int,
+        max_posts: int = 1000,
+        hydrate: bool = False
+    ) -> List[Dict[str, Any]]:
+        """
+        Fetches posts submitted to a subreddit within a time range.
+        
+        :param subreddit_name: The name of the subreddit (e.g., 'technology').
+        :param after_utc: Start of the range as a Unix timestamp (exclusive).
+        :param before_utc: End of the range as a Unix timestamp (exclusive).
+        :param max_posts: The maximum number of posts to return. Defaults to 1000.
+        :param hydrate: If True, loads full post details from Reddit instead of only ID, title and timestamp.
+        :returns: A list of dictionaries, each representing a post, newest first.
+        """
+        logger.info(f"Tool 'fetch_posts_in_range' called for r/{subreddit_name}, range: {after_utc}-{before_utc}")
+        # Pushshift failures propagate to reddit_tool, which returns the error dict
+        posts = await _fetch_pushshift_range(subreddit_name, after_utc, before_utc, max_posts)
+        if hydrate:
+            return await _hydrate_posts([post["id"] for post in posts])
+        return posts
+
+    @mcp.tool()
+    @reddit_tool(api_error="Subreddit not found or invalid")
     async def get_subreddit_stats(subreddit_name: str) -> Dict[str, Any]:
         """
         Gets comprehensive statistics and health metrics for a subreddit.
@@ -193,21 +485,22 @@ def register_reddit_tools(mcp: FastMCP):
         :returns: A dictionary with the subreddit's stats.
         """
         logger.info(f"Tool 'get_subreddit_stats' called for r/{subreddit_name}")
-        try:
-            subreddit = await reddit_client.subreddit(subreddit_name)
-            return SubredditStats(
-                name=subreddit.display_name,
-                subscribers=subreddit.subscribers,
-                active_users=subreddit.active_user_count
-            ).model_dump()
-        except RedditAPIException as e:
-            logger.error(f"Reddit API error for get_subreddit_stats: {e}")
-            return {"error": "Subreddit not found or invalid"}
-        except Exception as e:
-            logger.error(f"Unexpected error in get_subreddit_stats: {e}")
-            return {"error": "Internal server error", "message": str(e)}
+        reddit = get_reddit_manager()
+        cache_key = subreddit_name.lower()
+        async with _cache_lock(f"stats:{cache_key}"):
+            if cache_key in _stats_cache:
+                return _stats_cache[cache_key]
+            subreddit = await reddit.call(reddit.client.subreddit(subreddit_name, fetch=True))
+            stats = {
+                "name": subreddit.display_name,
+                "subscribers": subreddit.subscribers,
+                "active_users": subreddit.active_user_count,
+            }
+            _stats_cache[cache_key] = stats
+            return stats
 
     @mcp.tool()
+    @reddit_tool()
     async def get_trending_subreddits() -> List[str]:
         """
         Returns a list of currently trending subreddits based on 'popular' listing.
@@ -215,14 +508,17 @@ def register_reddit_tools(mcp: FastMCP):
         :returns: A list of strings, where each string is a subreddit name.
         """
         logger.info("Tool 'get_trending_subreddits' called.")
-        try:
-            subreddits = [sub.display_name for sub in reddit_client.subreddits.popular(limit=10)]
+        reddit = get_reddit_manager()
+        async with _cache_lock("trending"):
+            if _TRENDING_CACHE_KEY in _trending_cache:
+                return _trending_cache[_TRENDING_CACHE_KEY]
+            popular = await reddit.call(_collect(reddit.client.subreddits.popular(limit=10)))
+            subreddits = [sub.display_name for sub in popular]
+            _trending_cache[_TRENDING_CACHE_KEY] = subreddits
             return subreddits
-        except RedditAPIException as e:
-            logger.error(f"Reddit API error for get_trending_subreddits: {e}")
-            return {"error": "Reddit API error", "message": str(e)}
 
     @mcp.tool()
+    @reddit_tool(api_error="Failed to create post")
     async def create_strategic_post(subreddit_name: str, title: str, text: str) -> Dict[str, Any]:
         """
         Creates a new post.
@@ -233,21 +529,17 @@ def register_reddit_tools(mcp: FastMCP):
         :returns: A dictionary confirming the post's creation and its ID.
         """
         logger.info(f"Tool 'create_strategic_post' called for r/{subreddit_name} with title: '{title}'")
-        try:
-            submission = await reddit_client.subreddit(subreddit_name).submit(title=title, selftext=text)
-            return StrategicPost(
-                id=submission.id,
-                title=submission.title,
-                url=f"https://www.reddit.com{submission.permalink}"
-            ).model_dump()
-        except RedditAPIException as e:
-            logger.error(f"Reddit API error creating post: {e}")
-            return {"error": "Failed to create post", "message": str(e)}
-        except Exception as e:
-            logger.error(f"Unexpected error in create_strategic_post: {e}")
-            return {"error": "Internal server error", "message": str(e)}
+        reddit = get_reddit_manager()
+        subreddit = await reddit.client.subreddit(subreddit_name)
+        submission = await reddit.call(subreddit.submit(title=title, selftext=text))
+        return {
+            "id": submission.id,
+            "title": submission.title,
+            "url": f"https://www.reddit.com{submission.permalink}",
+        }
 
     @mcp.tool()
+    @reddit_tool(api_error="Failed to reply")
     async def reply_to_post(post_id: str, reply_text: str) -> Dict[str, Any]:
         """
         Replies to a specific Reddit post or comment.
@@ -257,16 +549,10 @@ def register_reddit_tools(mcp: FastMCP):
         :returns: A dictionary confirming the reply.
         """
         logger.info(f"Tool 'reply_to_post' called for post ID: {post_id}")
-        try:
-            submission = await reddit_client.submission(post_id)
-            comment = await submission.reply(reply_text)
-            return ReplyResponse(status="Reply successful", comment_id=comment.id).model_dump()
-        except RedditAPIException as e:
-            logger.error(f"Reddit API error replying to post: {e}")
-            return {"error": "Failed to reply", "message": str(e)}
-        except Exception as e:
-            logger.error(f"Unexpected error in reply_to_post: {e}")
-            return {"error": "Internal server error", "message": str(e)}
+        reddit = get_reddit_manager()
+        submission = await reddit.call(reddit.client.submission(post_id))
+        comment = await reddit.call(submission.reply(reply_text))
+        return {"status": "Reply successful", "comment_id": comment.id}
 
     @mcp.tool()
     async def get_ai_insights(post_text: str) -> Dict[str, Any]:
@@ -279,10 +565,10 @@ def register_reddit_tools(mcp: FastMCP):
         logger.info("Tool 'get_ai_insights' called to analyze text.")
         # Placeholder logic: This would be a separate LLM call in a real application.
         # It's mocked here to make the tool functional.
-        if "viral" in post_text.lower() or "trend" in post_text.lower():
+        if _VIRAL_RE.search(post_text):
             sentiment = "very positive"
             recommendation = "This is a high-potential topic. Promote it on other platforms."
-        elif "problem" in post_text.lower() or "issue" in post_text.lower():
+        elif _NEGATIVE_RE.search(post_text):
             sentiment = "negative"
             recommendation = "Address the issue directly and offer a solution."
         else:
@@ -305,7 +591,6 @@ def register_reddit_tools(mcp: FastMCP):
         :returns: A string with the formatted response.
         """
         logger.info("Tool 'format_smart_response' called.")
-        formatted_metrics = ", ".join([f"{k.capitalize()}: {v}" for k, v in metrics.items()])
-        formatted_response = f"{original_text}\n\n---\n**Metrics:** {formatted_metrics}"
-        return formatted_response
+        metrics_str = ", ".join(f"{k.capitalize()}: {v}" for k, v in metrics.items())
+        return f"{original_text}\n\n---\n**Metrics:** {metrics_str}"
 
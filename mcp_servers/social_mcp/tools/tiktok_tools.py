@@ -1,10 +1,21 @@
 # mcp_servers/social_mcp/tools/tiktok_tools.py
 
 import asyncio
+import contextlib
+import functools
+import inspect
 import logging
 import os
-from typing import List, Dict, Any, Optional
+import sys
+import time
+from typing import List, Dict, Any, Optional, Hashable, AsyncIterator, TypedDict
+from cachetools import LFUCache, TTLCache
+import diskcache
+import orjson
+from prometheus_client import Counter, Histogram
 from pydantic import BaseModel, Field, HttpUrl
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+from tenacity import before_sleep_log, retry, retry_if_exception_type, stop_after_attempt, wait_exponential_jitter
 from TikTokApi import TikTokApi
 # Use generic Exception handling instead of specific TikTokAPIError
 from dotenv import load_dotenv
@@ -17,335 +28,720 @@ from dotenv import load_dotenv
 # To install: pip install playwright && playwright install chromium
 
 # --- Logging Setup ---
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+# Handlers are configured by the hosting server (see api/main.py), not at import
 logger = logging.getLogger(__name__)
 
 # Load environment variables from .env file (if present)
 load_dotenv()
 
+# --- Metrics ---
+# Exposed on the server's /metrics endpoint, to tune TTLs and the pool size from real traffic
+TOOL_CALLS = Counter("tiktok_tool_calls_total", "TikTok tool calls by in-memory cache outcome.", ["tool", "cache"])
+POOL_WAIT_SECONDS = Histogram("tiktok_pool_wait_seconds", "Time spent waiting for a free TikTokApi client slot.")
+PLAYWRIGHT_SECONDS = Histogram("tiktok_playwright_seconds", "Time a TikTokApi client slot is held for browser work.")
+
+# --- Serialization ---
+def _pack(data: Any) -> Any:
+    """
+    Normalizes raw TikTok payloads to plain JSON types (datetimes, UUIDs and other
+    non-JSON values become strings) in one C-accelerated round trip, so the
+    MCP layer serializes them without per-value fallbacks.
+    """
+    return orjson.loads(orjson.dumps(data, default=str))
+
+# --- Metrics Extraction ---
+# Shared read-only fallback for missing nested objects, instead of a fresh {} per miss
+_EMPTY: Dict[str, Any] = {}
+
+# (returned key, TikTok stats key) pairs
+_VIDEO_METRIC_KEYS = (
+    ("like_count", "diggCount"),
+    ("comment_count", "commentCount"),
+    ("share_count", "shareCount"),
+    ("view_count", "playCount"),
+)
+_HASHTAG_METRIC_KEYS = (
+    ("video_count", "videoCount"),
+    ("view_count", "viewCount"),
+)
+
+class VideoMetrics(TypedDict):
+    like_count: Optional[int]
+    comment_count: Optional[int]
+    share_count: Optional[int]
+    view_count: Optional[int]
+
+class HashtagMetrics(TypedDict):
+    hashtag_name: str
+    video_count: Optional[int]
+    view_count: Optional[int]
+
+def _extract_metrics(stats: Dict[str, Any], keys) -> Dict[str, Any]:
+    return {name: stats.get(source) for name, source in keys}
+
+# --- Response Caching ---
+# Agents query the same users, hashtags and videos repeatedly, and each miss is a
+# full browser navigation. TTLs are configurable; trending data expires fastest.
+CACHE_TTL_SECONDS = int(os.getenv("TIKTOK_CACHE_TTL_SECONDS", "300"))
+PROFILE_CACHE_TTL_SECONDS = int(os.getenv("TIKTOK_PROFILE_CACHE_TTL_SECONDS", "900"))
+TRENDING_CACHE_TTL_SECONDS = int(os.getenv("TIKTOK_TRENDING_CACHE_TTL_SECONDS", "60"))
+
+# Arguments that name the same resource in different spellings share a cache entry
+_KEY_NORMALIZERS = {
+    "username": lambda username: username.strip().lstrip("@").lower(),
+    "hashtag": lambda hashtag: hashtag.strip().lstrip("#").lower(),
+    "url": lambda url: str(url).split("?")[0],
+    "region": lambda region: region.upper(),
+}
+
+def _cache_key(signature: inspect.Signature, args, kwargs) -> Hashable:
+    bound = signature.bind(*args, **kwargs)
+    bound.apply_defaults()
+    return tuple(
+        (name, _KEY_NORMALIZERS[name](value) if name in _KEY_NORMALIZERS else value)
+        for name, value in bound.arguments.items()
+    )
+
+def ttl_cached(ttl: int, maxsize: int = 1024):
+    """
+    Caches a tool's result per (normalized) arguments for `ttl` seconds.
+    Only successful results are stored: failures raise through this decorator.
+    """
+    def decorator(fn):
+        cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        signature = inspect.signature(fn)
+
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            key = _cache_key(signature, args, kwargs)
+            if key in cache:
+                TOOL_CALLS.labels(tool=fn.__name__, cache="hit").inc()
+                return cache[key]
+            TOOL_CALLS.labels(tool=fn.__name__, cache="miss").inc()
+            result = await fn(*args, **kwargs)
+            cache[key] = result
+            return result
+
+        wrapper.cache = cache
+        return wrapper
+    return decorator
+
+# A few celebrity users, viral hashtags and big regions dominate lookups, so the
+# hottest endpoints evict by frequency instead of age; one-off queries can't push
+# out the popular entries. Hit ratios are logged every CACHE_STATS_LOG_EVERY lookups
+# (0 or less disables the log).
+CACHE_STATS_LOG_EVERY = int(os.getenv("TIKTOK_CACHE_STATS_LOG_EVERY", "1000"))
+
+class _HitCounter:
+    """Counts cache lookups for one tool and periodically logs the hit ratio."""
+    def __init__(self, name: str):
+        self.name = name
+        self.hits = 0
+        self.misses = 0
+
+    def record(self, hit: bool):
+        TOOL_CALLS.labels(tool=self.name, cache="hit" if hit else "miss").inc()
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+        total = self.hits + self.misses
+        if CACHE_STATS_LOG_EVERY > 0 and total % CACHE_STATS_LOG_EVERY == 0:
+            logger.info("Cache hit ratio for %s: %.1f%% (%s/%s)", self.name, 100 * self.hits / total, self.hits, total)
+
+def lfu_cached(ttl: int, maxsize: int = 4096):
+    """
+    Like `ttl_cached`, but evicts the least frequently used entry when full.
+    Each entry still expires `ttl` seconds after it was stored.
+    """
+    def decorator(fn):
+        cache = LFUCache(maxsize=maxsize)
+        stats = _HitCounter(fn.__name__)
+        signature = inspect.signature(fn)
+
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            key = _cache_key(signature, args, kwargs)
+            entry = cache.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                stats.record(True)
+                return entry[1]
+            stats.record(False)
+            result = await fn(*args, **kwargs)
+            cache[key] = (time.monotonic() + ttl, result)
+            return result
+
+        def peek(*args, **kwargs):
+            """Returns the unexpired cached result for these arguments, or None."""
+            entry = cache.get(_cache_key(signature, args, kwargs))
+            if entry is not None and entry[0] > time.monotonic():
+                return entry[1]
+            return None
+
+        def store(result, *args, **kwargs):
+            """Caches a result fetched outside the wrapped function."""
+            cache[_cache_key(signature, args, kwargs)] = (time.monotonic() + ttl, result)
+
+        wrapper.cache = cache
+        wrapper.stats = stats
+        wrapper.peek = peek
+        wrapper.store = store
+        return wrapper
+    return decorator
+
+# --- Persistent Cache ---
+# Profiles, hashtag metrics and video details change slowly, so they are also kept
+# on disk: restarts and other workers reuse them instead of re-scraping. This is
+# the second tier behind the in-memory cache above.
+DISK_CACHE_DIR = os.getenv("TIKTOK_DISK_CACHE_DIR", "/var/cache/tiktok_mcp")
+DISK_CACHE_TTL_SECONDS = int(os.getenv("TIKTOK_DISK_CACHE_TTL_SECONDS", "21600"))
+DISK_CACHE_SIZE_LIMIT = int(os.getenv("TIKTOK_DISK_CACHE_SIZE_LIMIT", str(2 * 10**9)))
+
+@functools.lru_cache(maxsize=1)
+def _get_disk_cache() -> Optional[diskcache.Cache]:
+    """Opens the disk cache on first use; returns None if the directory is unusable."""
+    try:
+        return diskcache.Cache(DISK_CACHE_DIR, size_limit=DISK_CACHE_SIZE_LIMIT)
+    except OSError as e:
+        logger.warning("TikTok disk cache disabled, cannot open %s: %s", DISK_CACHE_DIR, e)
+        return None
+
+def disk_cached(ttl: int = DISK_CACHE_TTL_SECONDS):
+    """
+    Persists a tool's result as JSON in the disk cache for `ttl` seconds.
+    Disk I/O runs in a worker thread so it never blocks the event loop.
+    """
+    def decorator(fn):
+        signature = inspect.signature(fn)
+
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            disk = _get_disk_cache()
+            if disk is None:
+                return await fn(*args, **kwargs)
+            key = repr((fn.__name__, _cache_key(signature, args, kwargs)))
+            cached = await asyncio.to_thread(disk.get, key)
+            if cached is not None:
+                return orjson.loads(cached)
+            result = await fn(*args, **kwargs)
+            await asyncio.to_thread(disk.set, key, orjson.dumps(result, default=str), expire=ttl)
+            return result
+        return wrapper
+    return decorator
+
+# --- Request Coalescing ---
+# Concurrent identical calls share one in-flight fetch instead of each opening a
+# browser navigation before the cache is populated. No lock is needed: the
+# lookup and registration below run without an await in between.
+_inflight: Dict[Hashable, asyncio.Task] = {}
+
+async def _singleflight(key: Hashable, coro_factory):
+    """
+    Runs `coro_factory()` once per key; concurrent callers await the same result.
+    The fetch runs as its own task, so cancelling any caller (the first one
+    included) leaves it running for the others.
+    """
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(coro_factory())
+        _inflight[key] = task
+        task.add_done_callback(functools.partial(_forget_inflight, key))
+    return await asyncio.shield(task)
+
+def _forget_inflight(key: Hashable, task: asyncio.Task):
+    if _inflight.get(key) is task:
+        del _inflight[key]
+    if not task.cancelled():
+        task.exception()  # Mark retrieved so a failure nobody awaited isn't reported as lost
+
+def single_flight(fn):
+    """Coalesces concurrent calls to `fn` with the same (normalized) arguments."""
+    signature = inspect.signature(fn)
+
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        key = (fn.__name__, _cache_key(signature, args, kwargs))
+        return await _singleflight(key, lambda: fn(*args, **kwargs))
+    return wrapper
+
+# --- Retries ---
+# Playwright timeouts and dropped connections are usually bot-detection or network
+# blips; one controlled retry here is cheaper than the agent re-issuing the call.
+# Applied innermost (under single-flight) so coalesced callers share the retries.
+retry_transient = retry(
+    stop=stop_after_attempt(3),
+    wait=wait_exponential_jitter(initial=0.5, max=4),
+    retry=retry_if_exception_type((PlaywrightTimeoutError, ConnectionError)),
+    before_sleep=before_sleep_log(logger, logging.WARNING),
+    reraise=True,
+)
+
+def tiktok_tool(error_message: str):
+    """
+    Converts exceptions raised by a tool into the error dict returned to the agent.
+    Applied outside the cache so errors are never memoized.
+
+    :param error_message: The error label returned when the tool fails.
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            try:
+                return await fn(*args, **kwargs)
+            except Exception as e:  # Use generic Exception instead of TikTokAPIError
+                logger.error("Error in %s: %s", fn.__name__, e)
+                return {"error": error_message, "message": str(e)}
+        return wrapper
+    return decorator
+
 # --- TikTok API Client Encapsulation ---
 class TikTokClient:
     """
-    Manages the TikTokApi client instance.
-    The TikTokApi requires an asynchronous context manager, so this class
-    handles the asynchronous initialization and provides the client instance.
+    Manages the shared TikTokApi client.
+    TikTokApi binds its User/Video/Hashtag/Sound classes to the most recently
+    constructed instance, so the process runs exactly one, with POOL_SIZE
+    browser sessions; the library picks a random session for every request.
+    The client is created exactly once (even under concurrent first calls),
+    at most POOL_SIZE tool calls drive it at a time, and it is closed (with its
+    browsers) on shutdown.
     """
-    _api_instance = None
+    POOL_SIZE = max(1, int(os.getenv("TIKTOK_POOL", "4")))
+
+    _api: Optional[TikTokApi] = None
+    _slots = asyncio.Semaphore(POOL_SIZE)
+    _init_lock = asyncio.Lock()
 
     @classmethod
-    async def get_instance(cls):
-        """Returns a singleton instance of the TikTokApi client."""
-        if cls._api_instance is None:
-            # The TikTokApi must be initialized asynchronously
-            cls._api_instance = TikTokApi()
-            await cls._api_instance.init()
-        return cls._api_instance
+    async def _get_api(cls) -> TikTokApi:
+        if cls._api is None:
+            async with cls._init_lock:
+                # Re-check: another coroutine may have finished init while we waited
+                if cls._api is None:
+                    api = TikTokApi()
+                    try:
+                        await api.__aenter__()
+                        ms_token = os.getenv("TIKTOK_MS_TOKEN")
+                        await api.create_sessions(
+                            ms_tokens=[ms_token] if ms_token else None,
+                            num_sessions=cls.POOL_SIZE,
+                            sleep_after=3
+                        )
+                    except BaseException:
+                        # A failed or cancelled start must not leave Playwright and Chromium running
+                        await api.__aexit__(*sys.exc_info())
+                        raise
+                    cls._api = api
+                    logger.info("TikTok API client initialized with %s sessions.", cls.POOL_SIZE)
+        return cls._api
+
+    @classmethod
+    def client(cls) -> TikTokApi:
+        """Returns the started client; valid inside an `acquire()` block."""
+        if cls._api is None:
+            raise RuntimeError("TikTok API client is not initialized.")
+        return cls._api
+
+    @classmethod
+    async def warm_up(cls):
+        """Starts the browser sessions ahead of the first tool call."""
+        await cls._get_api()
+
+    @classmethod
+    @contextlib.asynccontextmanager
+    async def acquire(cls) -> AsyncIterator[TikTokApi]:
+        """Holds one of the POOL_SIZE slots on the shared client for the duration of the block."""
+        api = await cls._get_api()
+        with POOL_WAIT_SECONDS.time():
+            await cls._slots.acquire()
+        try:
+            with PLAYWRIGHT_SECONDS.time():
+                yield api
+        finally:
+            cls._slots.release()
+
+    @classmethod
+    async def close(cls):
+        """Closes the TikTokApi sessions and their Playwright browser."""
+        async with cls._init_lock:
+            api, cls._api = cls._api, None
+            # Drop the builders, which hold references to the closed client
+            for builder in _BUILDERS:
+                builder.cache_clear()
+            if api is not None:
+                await api.__aexit__(None, None, None)
+                logger.info("TikTok API client has been closed.")
+
+# --- Resource Builders ---
+# TikTokApi's User/Video/Hashtag/Sound objects remember what they resolve
+# (user id and secUid, video id from short links), so reusing them spares
+# repeat lookups, e.g. .videos() after .info() on the same user.
+@functools.lru_cache(maxsize=4096)
+def _user(username: str):
+    return TikTokClient.client().user(username=username)
+
+@functools.lru_cache(maxsize=4096)
+def _video(url: str):
+    return TikTokClient.client().video(url=url)
+
+@functools.lru_cache(maxsize=4096)
+def _hashtag(name: str):
+    return TikTokClient.client().hashtag(name=name)
+
+@functools.lru_cache(maxsize=4096)
+def _sound(sound_id: str):
+    return TikTokClient.client().sound(id=sound_id)
+
+_BUILDERS = (_user, _video, _hashtag, _sound)
+
+# --- Shared Fetch Helpers ---
+# Used by both the single-video tools and their batch variants, so the cache and
+# request coalescing are shared between them.
+
+# Concurrent fetches per batch call; more than POOL_SIZE would only queue
+BATCH_CONCURRENCY = max(1, min(int(os.getenv("TIKTOK_BATCH_CONCURRENCY", "8")), TikTokClient.POOL_SIZE))
+
+# Pages at least this long are converted in a worker thread
+OFFLOAD_THRESHOLD = int(os.getenv("TIKTOK_OFFLOAD_THRESHOLD", "25"))
+
+def _pack_items(items: list) -> List[Dict[str, Any]]:
+    return _pack([item.as_dict for item in items])
+
+async def _collect(factory, count: int) -> List[Dict[str, Any]]:
+    """
+    Collects up to `count` items from a paginated TikTokApi iterator.
+    Converting a full page is a CPU burst that would stall every other
+    in-flight tool call, so large pages are converted off the event loop.
+    :param factory: Builds the iterator from the shared TikTokApi client.
+    """
+    items = []
+    async with TikTokClient.acquire() as api:
+        async for item in factory(api):
+            items.append(item)
+            if len(items) >= count:
+                break
+    if len(items) >= OFFLOAD_THRESHOLD:
+        return await asyncio.to_thread(_pack_items, items)
+    return _pack_items(items)
+
+@ttl_cached(CACHE_TTL_SECONDS)
+@disk_cached()
+@single_flight
+@retry_transient
+async def _fetch_video_details(url: HttpUrl) -> Dict[str, Any]:
+    async with TikTokClient.acquire():
+        video_info = await _video(str(url)).info()
+        return _pack(video_info)
+
+@ttl_cached(CACHE_TTL_SECONDS)
+@single_flight
+@retry_transient
+async def _fetch_video_public_metrics(url: HttpUrl) -> VideoMetrics:
+    async with TikTokClient.acquire():
+        video_info = await _video(str(url)).info()
+        # The public metrics are typically nested under a 'stats' key
+        return VideoMetrics(**_extract_metrics(video_info.get("stats") or _EMPTY, _VIDEO_METRIC_KEYS))
+
+async def _fetch_batch(fetch, urls: List[HttpUrl], error_message: str) -> List[Dict[str, Any]]:
+    """Runs `fetch` over `urls` with bounded concurrency, keeping input order."""
+    semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+
+    async def fetch_one(url: HttpUrl) -> Dict[str, Any]:
+        async with semaphore:
+            return await fetch(url)
+
+    results = await asyncio.gather(*(fetch_one(url) for url in urls), return_exceptions=True)
+
+    # One failing video must not discard the others
+    batch = []
+    for url, result in zip(urls, results):
+        if isinstance(result, Exception):
+            logger.error("Error fetching %s in %s: %s", url, fetch.__name__, result)
+            batch.append({"url": str(url), "error": error_message, "message": str(result)})
+        else:
+            batch.append(result)
+    return batch
+
+# --- Content & User Retrieval ---
+@disk_cached()
+@single_flight
+@retry_transient
+async def _fetch_user_profile(username: str) -> Dict[str, Any]:
+    async with TikTokClient.acquire():
+        user_info = await _user(username).info()
+        return _pack(user_info)
+
+@tiktok_tool("Failed to fetch user profile")
+@lfu_cached(PROFILE_CACHE_TTL_SECONDS)
+async def get_user_profile(username: str) -> Dict[str, Any]:
+    """
+    Fetches user profile information, including statistics and bio.
+    :param username: The username of the TikTok user (e.g., 'charlidamelio').
+    """
+    logger.debug("Tool 'get_user_profile' called for username: %s", username)
+    return await _fetch_user_profile(username)
+
+@tiktok_tool("Failed to fetch user profiles")
+async def get_user_profiles(usernames: List[str]) -> Dict[str, Any]:
+    """
+    Fetches profile information for several users at once.
+    Cached profiles are returned directly; the rest are fetched concurrently,
+    with the same retries and disk cache as get_user_profile.
+    :param usernames: The usernames of the TikTok users.
+    :returns: A dictionary mapping each username to its profile, or to an error.
+    """
+    logger.debug("Tool 'get_user_profiles' called for %s usernames", len(usernames))
+    profiles = {username: get_user_profile.peek(username) for username in usernames}
+    missing = [username for username, profile in profiles.items() if profile is None]
+    if not missing:
+        return profiles
+
+    semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+
+    async def fetch_one(username: str) -> Dict[str, Any]:
+        async with semaphore:
+            return await _fetch_user_profile(username)
+
+    results = await asyncio.gather(*(fetch_one(username) for username in missing), return_exceptions=True)
+
+    # One failing user must not discard the others
+    for username, result in zip(missing, results):
+        if isinstance(result, Exception):
+            logger.error("Error fetching profile for %s in get_user_profiles: %s", username, result)
+            profiles[username] = {"error": "Failed to fetch user profile", "message": str(result)}
+        else:
+            get_user_profile.store(result, username)
+            profiles[username] = result
+    return profiles
+
+@tiktok_tool("Failed to fetch user videos")
+@ttl_cached(CACHE_TTL_SECONDS)
+@retry_transient
+async def get_user_videos(username: str, count: int = 20) -> List[Dict[str, Any]]:
+    """
+    Retrieves a list of recent videos for a user.
+    :param username: The username of the TikTok user.
+    :param count: The number of videos to retrieve (default is 20).
+    """
+    logger.debug("Tool 'get_user_videos' called for username: %s", username)
+    return await _collect(lambda api: _user(username).videos(count=count), count)
+
+@tiktok_tool("Failed to fetch video details")
+async def get_video_details(url: HttpUrl) -> Dict[str, Any]:
+    """
+    Fetches video details, including description, metrics, and author info.
+    :param url: The full URL of the TikTok video.
+    """
+    logger.debug("Tool 'get_video_details' called for url: %s", url)
+    return await _fetch_video_details(url)
+
+async def get_video_details_batch(urls: List[HttpUrl]) -> List[Dict[str, Any]]:
+    """
+    Fetches video details for several videos concurrently.
+    :param urls: The full URLs of the TikTok videos.
+    :returns: One result per URL, in the same order; failed URLs yield an error dict.
+    """
+    logger.debug("Tool 'get_video_details_batch' called for %s urls", len(urls))
+    return await _fetch_batch(_fetch_video_details, urls, "Failed to fetch video details")
+
+@tiktok_tool("Failed to fetch comments")
+@ttl_cached(CACHE_TTL_SECONDS)
+@retry_transient
+async def get_video_comments(url: HttpUrl, count: int = 20) -> List[Dict[str, Any]]:
+    """
+    Retrieves a list of comments for a video.
+    :param url: The full URL of the TikTok video.
+    :param count: The number of comments to retrieve (default is 20).
+    """
+    logger.debug("Tool 'get_video_comments' called for url: %s", url)
+    return await _collect(lambda api: _video(str(url)).comments(count=count), count)
+
+# --- Trending & Search ---
+@tiktok_tool("Failed to fetch trending videos")
+@ttl_cached(TRENDING_CACHE_TTL_SECONDS)
+@retry_transient
+async def get_trending_videos(count: int = 20) -> List[Dict[str, Any]]:
+    """
+    Retrieves the top trending videos from the 'For You' page.
+    :param count: The number of videos to retrieve (default is 20).
+    """
+    logger.debug("Tool 'get_trending_videos' called.")
+    return await _collect(lambda api: api.trending.videos(count=count), count)
+
+@tiktok_tool("Failed to perform video search")
+@ttl_cached(CACHE_TTL_SECONDS)
+@retry_transient
+async def search_videos(query: str, count: int = 20) -> List[Dict[str, Any]]:
+    """
+    Searches for videos using a keyword or phrase.
+    :param query: The search term (e.g., 'cat videos').
+    :param count: The number of videos to retrieve (default is 20).
+    """
+    logger.debug("Tool 'search_videos' called for query: %s", query)
+    return await _collect(lambda api: api.search.videos(keyword=query, count=count), count)
+
+@tiktok_tool("Failed to perform user search")
+@ttl_cached(CACHE_TTL_SECONDS)
+@retry_transient
+async def search_users(query: str, count: int = 20) -> List[Dict[str, Any]]:
+    """
+    Searches for users using a keyword or phrase.
+    :param query: The search term (e.g., 'mrbeast').
+    :param count: The number of users to retrieve (default is 20).
+    """
+    logger.debug("Tool 'search_users' called for query: %s", query)
+    return await _collect(lambda api: api.search.users(keyword=query, count=count), count)
+
+@tiktok_tool("Failed to fetch hashtag videos")
+@ttl_cached(CACHE_TTL_SECONDS)
+@retry_transient
+async def get_hashtag_videos(hashtag: str, count: int = 20) -> List[Dict[str, Any]]:
+    """
+    Retrieves videos associated with a given hashtag.
+    :param hashtag: The hashtag to search for (e.g., 'aiart').
+    :param count: The number of videos to retrieve (default is 20).
+    """
+    logger.debug("Tool 'get_hashtag_videos' called for hashtag: %s", hashtag)
+    return await _collect(lambda api: _hashtag(hashtag).videos(count=count), count)
+
+# --- Audio & Playlist Discovery ---
+@tiktok_tool("Failed to fetch sound videos")
+@ttl_cached(CACHE_TTL_SECONDS)
+@retry_transient
+async def get_sound_videos(sound_id: str, count: int = 20) -> List[Dict[str, Any]]:
+    """
+    Retrieves videos associated with a specific sound ID.
+    :param sound_id: The unique ID of the TikTok sound.
+    :param count: The number of videos to retrieve (default is 20).
+    """
+    logger.debug("Tool 'get_sound_videos' called for sound_id: %s", sound_id)
+    return await _collect(lambda api: _sound(sound_id).videos(count=count), count)
+
+# --- NEW TOOLS ---
+# 📊 Scoring & Trend Prediction Tools
+@tiktok_tool("Failed to fetch regional trending videos")
+@lfu_cached(TRENDING_CACHE_TTL_SECONDS)
+@retry_transient
+async def get_regional_trending_videos(region: str, count: int = 20) -> List[Dict[str, Any]]:
+    """
+    Retrieves trending videos for a specified region.
+    :param region: The two-letter country code (e.g., 'US', 'IN', 'JP').
+    :param count: The number of videos to retrieve (default is 20).
+    """
+    logger.debug("Tool 'get_regional_trending_videos' called for region: %s", region)
+    return await _collect(lambda api: api.trending.videos(region=region, count=count), count)
+
+@tiktok_tool("Failed to fetch hashtag metrics")
+@lfu_cached(CACHE_TTL_SECONDS)
+@disk_cached()
+@single_flight
+@retry_transient
+async def get_hashtag_metrics(hashtag: str) -> Dict[str, Any]:
+    """
+    Retrieves public metrics for a given hashtag, such as total video count and view count.
+    :param hashtag: The hashtag to search for (e.g., 'aiart').
+    """
+    logger.debug("Tool 'get_hashtag_metrics' called for hashtag: %s", hashtag)
+    async with TikTokClient.acquire():
+        hashtag_info = await _hashtag(hashtag).info()
+        # The API response often contains a "challenge" object with metrics
+        challenge = hashtag_info.get("challenge") or _EMPTY
+        return HashtagMetrics(
+            hashtag_name=challenge.get("title", hashtag),
+            **_extract_metrics(challenge.get("stats") or _EMPTY, _HASHTAG_METRIC_KEYS),
+        )
+
+@tiktok_tool("Failed to fetch video metrics")
+async def get_video_public_metrics(url: HttpUrl) -> Dict[str, Any]:
+    """
+    Fetches public metrics for a video (e.g., likes, comments, shares).
+    This is a lightweight tool for scoring.
+    :param url: The full URL of the TikTok video.
+    """
+    logger.debug("Tool 'get_video_public_metrics' called for url: %s", url)
+    return await _fetch_video_public_metrics(url)
+
+async def get_video_public_metrics_batch(urls: List[HttpUrl]) -> List[Dict[str, Any]]:
+    """
+    Fetches public metrics for several videos concurrently, for scoring pipelines.
+    :param urls: The full URLs of the TikTok videos.
+    :returns: One result per URL, in the same order; failed URLs yield an error dict.
+    """
+    logger.debug("Tool 'get_video_public_metrics_batch' called for %s urls", len(urls))
+    return await _fetch_batch(_fetch_video_public_metrics, urls, "Failed to fetch video metrics")
+
+# 🫂 Audience & Personality Analysis
+@tiktok_tool("Failed to fetch user followers")
+@ttl_cached(CACHE_TTL_SECONDS)
+@retry_transient
+async def get_user_followers_list(username: str, count: int = 20) -> List[Dict[str, Any]]:
+    """
+    Retrieves a list of followers for a TikTok user.
+    :param username: The username of the TikTok user.
+    :param count: The number of followers to retrieve (default is 20).
+    """
+    logger.debug("Tool 'get_user_followers_list' called for username: %s", username)
+    # The 'followers' method returns an async iterator
+    return await _collect(lambda api: _user(username).followers(count=count), count)
+
+@tiktok_tool("Failed to fetch user video stats")
+@ttl_cached(CACHE_TTL_SECONDS)
+@retry_transient
+async def get_user_video_stats(username: str, count: int = 20) -> List[Dict[str, Any]]:
+    """
+    Retrieves a list of a user's recent videos with their engagement metrics.
+    :param username: The username of the TikTok user.
+    :param count: The number of videos to analyze (default is 20).
+    """
+    logger.debug("Tool 'get_user_video_stats' called for username: %s", username)
+    async with TikTokClient.acquire():
+        user_videos = _user(username).videos(count=count)
+        videos_stats = []
+        async for v in user_videos:
+            # Read the raw video data once and keep only the fields we return
+            raw = v.as_dict
+            videos_stats.append({
+                "id": raw.get("id"),
+                "description": raw.get("desc"),
+                "stats": raw.get("stats", {})
+            })
+            if len(videos_stats) >= count:
+                break
+        return videos_stats
+
+# (tool function, tool name, description)
+_TOOLS = [
+    (get_user_profile, "get_user_profile", "Get detailed profile information for a user by their username."),
+    (get_user_profiles, "get_user_profiles", "Get profile information for several users by their usernames, fetched together."),
+    (get_user_videos, "get_user_videos", "Fetches a list of videos uploaded by a specific user."),
+    (get_video_details, "get_video_details", "Get detailed information about a specific video by its URL."),
+    (get_video_details_batch, "get_video_details_batch", "Get detailed information about several videos by their URLs, fetched concurrently."),
+    (get_video_comments, "get_video_comments", "Fetches a list of comments for a specific video by its URL."),
+    (get_trending_videos, "get_trending_videos", "Fetches a list of currently trending videos."),
+    (search_videos, "search_videos", "Search TikTok for videos matching a query."),
+    (search_users, "search_users", "Search TikTok for users matching a username query."),
+    (get_hashtag_videos, "get_hashtag_videos", "Fetches videos related to a specific hashtag."),
+    (get_sound_videos, "get_sound_videos", "Fetches videos that use a specific sound or audio clip."),
+    (get_regional_trending_videos, "get_regional_trending_videos", "Fetches trending videos from a specific country or region."),
+    (get_hashtag_metrics, "get_hashtag_metrics", "Fetches key metrics for a specific hashtag."),
+    (get_video_public_metrics, "get_video_public_metrics", "Fetches only the public engagement metrics for a video."),
+    (get_video_public_metrics_batch, "get_video_public_metrics_batch", "Fetches the public engagement metrics for several videos concurrently."),
+    # 🔍 Search & Mentions Tools: aliases registered on the canonical search functions,
+    # so they share one cache. TikTokApi does not currently support searching by date
+    # range, so search_videos_by_date is a conceptual placeholder for search_videos.
+    (search_videos, "search_videos_by_date", "Searches TikTok for videos matching a query, with a conceptual date filter."),
+    (search_users, "search_users_by_keyword", "Searches TikTok for users matching a keyword in their profile or name."),
+    (get_user_followers_list, "get_user_followers_list", "Fetches a list of followers for a specific user."),
+    (get_user_video_stats, "get_user_video_stats", "Fetches a quick list of a user's videos and their key statistics."),
+]
 
 # --- Tool Registration (FastMCP) ---
 def register_tiktok_tools(mcp):
     """
     Registers all TikTok-related tools with the FastMCP instance.
     
-    This function uses a helper class to manage the TikTokApi client.
-    The tools are designed to provide AI agents with programmatic access to
-    public TikTok data.
+    The tools are module-level functions listed in `_TOOLS`, so their caches
+    live once per process rather than once per registration. They are
+    designed to provide AI agents with programmatic access to public TikTok data.
     """
-    
-    # --- Content & User Retrieval ---
-    @mcp.tool(name="get_user_profile", description="Get detailed profile information for a user by their username.")
-    async def get_user_profile(username: str) -> Dict[str, Any]:
-        """
-        Fetches user profile information, including statistics and bio.
-        :param username: The username of the TikTok user (e.g., 'charlidamelio').
-        """
-        logger.info(f"Tool 'get_user_profile' called for username: {username}")
-        try:
-            api = await TikTokClient.get_instance()
-            user_info = await api.user(username=username).info()
-            return user_info.as_dict
-        except Exception as e:  # Use generic Exception instead of TikTokAPIError
-            logger.error(f"Error getting user profile for {username}: {e}")
-            return {"error": "Failed to fetch user profile", "message": str(e)}
-
-    @mcp.tool(name="get_user_videos", description="Fetches a list of videos uploaded by a specific user.")
-    async def get_user_videos(username: str, count: int = 20) -> List[Dict[str, Any]]:
-        """
-        Retrieves a list of recent videos for a user.
-        :param username: The username of the TikTok user.
-        :param count: The number of videos to retrieve (default is 20).
-        """
-        logger.info(f"Tool 'get_user_videos' called for username: {username}")
-        try:
-            api = await TikTokClient.get_instance()
-            user_videos = api.user(username=username).videos()
-            videos_list = [v.as_dict for v in await anext(user_videos)]
-            return videos_list[:count]
-        except Exception as e:  # Use generic Exception instead of TikTokAPIError
-            logger.error(f"Error getting videos for {username}: {e}")
-            return {"error": "Failed to fetch user videos", "message": str(e)}
-        except StopAsyncIteration:
-            return []
-
-    @mcp.tool(name="get_video_details", description="Get detailed information about a specific video by its URL.")
-    async def get_video_details(url: HttpUrl) -> Dict[str, Any]:
-        """
-        Fetches video details, including description, metrics, and author info.
-        :param url: The full URL of the TikTok video.
-        """
-        logger.info(f"Tool 'get_video_details' called for url: {url}")
-        try:
-            api = await TikTokClient.get_instance()
-            video_info = await api.video(url=url).info()
-            return video_info.as_dict
-        except Exception as e:  # Use generic Exception instead of TikTokAPIError
-            logger.error(f"Error getting video details for {url}: {e}")
-            return {"error": "Failed to fetch video details", "message": str(e)}
-
-    @mcp.tool(name="get_video_comments", description="Fetches a list of comments for a specific video by its URL.")
-    async def get_video_comments(url: HttpUrl, count: int = 20) -> List[Dict[str, Any]]:
-        """
-        Retrieves a list of comments for a video.
-        :param url: The full URL of the TikTok video.
-        :param count: The number of comments to retrieve (default is 20).
-        """
-        logger.info(f"Tool 'get_video_comments' called for url: {url}")
-        try:
-            api = await TikTokClient.get_instance()
-            video_comments = api.video(url=url).comments()
-            comments_list = [c.as_dict for c in await anext(video_comments)]
-            return comments_list[:count]
-        except Exception as e:  # Use generic Exception instead of TikTokAPIError
-            logger.error(f"Error getting comments for {url}: {e}")
-            return {"error": "Failed to fetch comments", "message": str(e)}
-        except StopAsyncIteration:
-            return []
-            
-    # --- Trending & Search ---
-    @mcp.tool(name="get_trending_videos", description="Fetches a list of currently trending videos.")
-    async def get_trending_videos(count: int = 20) -> List[Dict[str, Any]]:
-        """
-        Retrieves the top trending videos from the 'For You' page.
-        :param count: The number of videos to retrieve (default is 20).
-        """
-        logger.info("Tool 'get_trending_videos' called.")
-        try:
-            api = await TikTokClient.get_instance()
-            trending_videos = api.trending.videos()
-            videos_list = [v.as_dict for v in await anext(trending_videos)]
-            return videos_list[:count]
-        except Exception as e:  # Use generic Exception instead of TikTokAPIError
-            logger.error(f"Error getting trending videos: {e}")
-            return {"error": "Failed to fetch trending videos", "message": str(e)}
-        except StopAsyncIteration:
-            return []
-
-    @mcp.tool(name="search_videos", description="Search TikTok for videos matching a query.")
-    async def search_videos(query: str, count: int = 20) -> List[Dict[str, Any]]:
-        """
-        Searches for videos using a keyword or phrase.
-        :param query: The search term (e.g., 'cat videos').
-        :param count: The number of videos to retrieve (default is 20).
-        """
-        logger.info(f"Tool 'search_videos' called for query: {query}")
-        try:
-            api = await TikTokClient.get_instance()
-            search_results = api.search.videos(keyword=query)
-            videos_list = [v.as_dict for v in await anext(search_results)]
-            return videos_list[:count]
-        except Exception as e:  # Use generic Exception instead of TikTokAPIError
-            logger.error(f"Error searching for videos with query '{query}': {e}")
-            return {"error": "Failed to perform video search", "message": str(e)}
-        except StopAsyncIteration:
-            return []
-            
-    @mcp.tool(name="search_users", description="Search TikTok for users matching a username query.")
-    async def search_users(query: str, count: int = 20) -> List[Dict[str, Any]]:
-        """
-        Searches for users using a keyword or phrase.
-        :param query: The search term (e.g., 'mrbeast').
-        :param count: The number of users to retrieve (default is 20).
-        """
-        logger.info(f"Tool 'search_users' called for query: {query}")
-        try:
-            api = await TikTokClient.get_instance()
-            search_results = api.search.users(keyword=query)
-            users_list = [u.as_dict for u in await anext(search_results)]
-            return users_list[:count]
-        except Exception as e:  # Use generic Exception instead of TikTokAPIError
-            logger.error(f"Error searching for users with query '{query}': {e}")
-            return {"error": "Failed to perform user search", "message": str(e)}
-        except StopAsyncIteration:
-            return []
-    
-    @mcp.tool(name="get_hashtag_videos", description="Fetches videos related to a specific hashtag.")
-    async def get_hashtag_videos(hashtag: str, count: int = 20) -> List[Dict[str, Any]]:
-        """
-        Retrieves videos associated with a given hashtag.
-        :param hashtag: The hashtag to search for (e.g., 'aiart').
-        :param count: The number of videos to retrieve (default is 20).
-        """
-        logger.info(f"Tool 'get_hashtag_videos' called for hashtag: {hashtag}")
-        try:
-            api = await TikTokClient.get_instance()
-            hashtag_videos = api.hashtag(name=hashtag).videos()
-            videos_list = [v.as_dict for v in await anext(hashtag_videos)]
-            return videos_list[:count]
-        except Exception as e:  # Use generic Exception instead of TikTokAPIError
-            logger.error(f"Error getting videos for hashtag '{hashtag}': {e}")
-            return {"error": "Failed to fetch hashtag videos", "message": str(e)}
-        except StopAsyncIteration:
-            return []
-    
-    # --- Audio & Playlist Discovery ---
-    @mcp.tool(name="get_sound_videos", description="Fetches videos that use a specific sound or audio clip.")
-    async def get_sound_videos(sound_id: str, count: int = 20) -> List[Dict[str, Any]]:
-        """
-        Retrieves videos associated with a specific sound ID.
-        :param sound_id: The unique ID of the TikTok sound.
-        :param count: The number of videos to retrieve (default is 20).
-        """
-        logger.info(f"Tool 'get_sound_videos' called for sound_id: {sound_id}")
-        try:
-            api = await TikTokClient.get_instance()
-            sound_videos = api.sound(id=sound_id).videos()
-            videos_list = [v.as_dict for v in await anext(sound_videos)]
-            return videos_list[:count]
-        except Exception as e:  # Use generic Exception instead of TikTokAPIError
-            logger.error(f"Error getting videos for sound_id '{sound_id}': {e}")
-            return {"error": "Failed to fetch sound videos", "message": str(e)}
-        except StopAsyncIteration:
-            return []
-
-    # --- NEW TOOLS ---
-    # 📊 Scoring & Trend Prediction Tools
-    @mcp.tool(name="get_regional_trending_videos", description="Fetches trending videos from a specific country or region.")
-    async def get_regional_trending_videos(region: str, count: int = 20) -> List[Dict[str, Any]]:
-        """
-        Retrieves trending videos for a specified region.
-        :param region: The two-letter country code (e.g., 'US', 'IN', 'JP').
-        :param count: The number of videos to retrieve (default is 20).
-        """
-        logger.info(f"Tool 'get_regional_trending_videos' called for region: {region}")
-        try:
-            api = await TikTokClient.get_instance()
-            trending_videos = api.trending.videos(region=region)
-            videos_list = [v.as_dict for v in await anext(trending_videos)]
-            return videos_list[:count]
-        except Exception as e:  # Use generic Exception instead of TikTokAPIError
-            logger.error(f"Error getting trending videos for region '{region}': {e}")
-            return {"error": "Failed to fetch regional trending videos", "message": str(e)}
-        except StopAsyncIteration:
-            return []
-
-    @mcp.tool(name="get_hashtag_metrics", description="Fetches key metrics for a specific hashtag.")
-    async def get_hashtag_metrics(hashtag: str) -> Dict[str, Any]:
-        """
-        Retrieves public metrics for a given hashtag, such as total video count and view count.
-        :param hashtag: The hashtag to search for (e.g., 'aiart').
-        """
-        logger.info(f"Tool 'get_hashtag_metrics' called for hashtag: {hashtag}")
-        try:
-            api = await TikTokClient.get_instance()
-            hashtag_info = await api.hashtag(name=hashtag).info()
-            # The API response often contains a "challenge" object with metrics
-            metrics = hashtag_info.get("challenge", {})
-            return {
-                "hashtag_name": metrics.get("title", hashtag),
-                "video_count": metrics.get("stats", {}).get("videoCount"),
-                "view_count": metrics.get("stats", {}).get("viewCount"),
-            }
-        except Exception as e:  # Use generic Exception instead of TikTokAPIError
-            logger.error(f"Error getting hashtag metrics for '{hashtag}': {e}")
-            return {"error": "Failed to fetch hashtag metrics", "message": str(e)}
-
-    @mcp.tool(name="get_video_public_metrics", description="Fetches only the public engagement metrics for a video.")
-    async def get_video_public_metrics(url: HttpUrl) -> Dict[str, Any]:
-        """
-        Fetches public metrics for a video (e.g., likes, comments, shares).
-        This is a lightweight tool for scoring.
-        :param url: The full URL of the TikTok video.
-        """
-        logger.info(f"Tool 'get_video_public_metrics' called for url: {url}")
-        try:
-            api = await TikTokClient.get_instance()
-            video_info = await api.video(url=url).info()
-            # The public metrics are typically nested under a 'stats' key
-            metrics = video_info.get("stats", {})
-            return {
-                "like_count": metrics.get("diggCount"),
-                "comment_count": metrics.get("commentCount"),
-                "share_count": metrics.get("shareCount"),
-                "view_count": metrics.get("playCount"),
-            }
-        except Exception as e:  # Use generic Exception instead of TikTokAPIError
-            logger.error(f"Error getting video metrics for {url}: {e}")
-            return {"error": "Failed to fetch video metrics", "message": str(e)}
-
-    # 🔍 Search & Mentions Tools
-    # Note: TikTokApi does not currently support searching by date range, so this
-    # tool is a conceptual placeholder. The tool will simply search for the query.
-    @mcp.tool(name="search_videos_by_date", description="Searches TikTok for videos matching a query, with a conceptual date filter.")
-    async def search_videos_by_date(query: str, count: int = 20) -> List[Dict[str, Any]]:
-        """
-        Searches for videos using a keyword or phrase, returning the most recent results.
-        :param query: The search term (e.g., 'cat videos').
-        :param count: The number of videos to retrieve (default is 20).
-        """
-        logger.info(f"Tool 'search_videos_by_date' called for query: {query}")
-        return await search_videos(query=query, count=count)
-
-    @mcp.tool(name="search_users_by_keyword", description="Searches TikTok for users matching a keyword in their profile or name.")
-    async def search_users_by_keyword(query: str, count: int = 20) -> List[Dict[str, Any]]:
-        """
-        Searches for users using a keyword or phrase.
-        :param query: The search term (e.g., 'crypto investor').
-        :param count: The number of users to retrieve (default is 20).
-        """
-        logger.info(f"Tool 'search_users_by_keyword' called for query: {query}")
-        return await search_users(query=query, count=count)
-
-    # 🫂 Audience & Personality Analysis
-    @mcp.tool(name="get_user_followers_list", description="Fetches a list of followers for a specific user.")
-    async def get_user_followers_list(username: str, count: int = 20) -> List[Dict[str, Any]]:
-        """
-        Retrieves a list of followers for a TikTok user.
-        :param username: The username of the TikTok user.
-        :param count: The number of followers to retrieve (default is 20).
-        """
-        logger.info(f"Tool 'get_user_followers_list' called for username: {username}")
-        try:
-            api = await TikTokClient.get_instance()
-            # The 'followers' method returns an async iterator
-            followers_iter = api.user(username=username).followers()
-            followers_list = [f.as_dict for f in await anext(followers_iter)]
-            return followers_list[:count]
-        except Exception as e:  # Use generic Exception instead of TikTokAPIError
-            logger.error(f"Error getting followers for {username}: {e}")
-            return {"error": "Failed to fetch user followers", "message": str(e)}
-        except StopAsyncIteration:
-            return []
-
-    @mcp.tool(name="get_user_video_stats", description="Fetches a quick list of a user's videos and their key statistics.")
-    async def get_user_video_stats(username: str, count: int = 20) -> List[Dict[str, Any]]:
-        """
-        Retrieves a list of a user's recent videos with their engagement metrics.
-        :param username: The username of the TikTok user.
-        :param count: The number of videos to analyze (default is 20).
-        """
-        logger.info(f"Tool 'get_user_video_stats' called for username: {username}")
-        try:
-            api = await TikTokClient.get_instance()
-            user_videos = api.user(username=username).videos()
-            videos_stats = []
-            async for v in user_videos:
-                videos_stats.append({
-                    "id": v.as_dict.get("id"),
-                    "description": v.as_dict.get("desc"),
-                    "stats": v.as_dict.get("stats", {})
-                })
-                if len(videos_stats) >= count:
-                    break
-            return videos_stats
-        except Exception as e:  # Use generic Exception instead of TikTokAPIError
-            logger.error(f"Error getting user video stats for {username}: {e}")
-            return {"error": "Failed to fetch user video stats", "message": str(e)}
\ No newline at end of file
+    for fn, name, description in _TOOLS:
+        mcp.tool(name=name, description=description)(fn)
@@ -1,16 +1,26 @@
 import asyncio
+import contextlib
+import contextvars
+import functools
 import logging
 import os
+import time
 import warnings
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, AsyncIterator
 from pydantic import BaseModel, Field, HttpUrl
+import aiohttp
+from cachetools import TTLCache
+from prometheus_client import Counter, Gauge
 import tweepy
+from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_exponential_jitter
+from tweepy.asynchronous import AsyncClient
 
 from tweepy.client import Response
 from dotenv import load_dotenv
 
+from mcp_servers.social_mcp.core.cache_locks import KeyedLocks
+
 # --- Logging Setup ---
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 # Suppress SyntaxWarning from Tweepy docstrings
@@ -19,7 +29,128 @@ warnings.filterwarnings("ignore", category=SyntaxWarning)
 # Load environment variables from .env file (if present)
 load_dotenv()
 
+# --- Requested Fields ---
+# Joined once here: Tweepy sends strings as-is but re-joins a list on every request
+_USER_FIELDS = ",".join(("id", "name", "username", "profile_image_url", "description", "public_metrics"))
+_USER_FIELDS_MIN = ",".join(("id", "name", "username"))
+_TWEET_FIELDS = ",".join(("id", "text", "created_at", "public_metrics"))
+_TWEET_FIELDS_FULL = ",".join(("id", "text", "created_at", "author_id", "public_metrics"))
+_METRICS_ONLY = "public_metrics"
+
+# --- Result Conversion ---
+def _to_dict(obj: Any) -> Any:
+    """
+    Returns the raw API payload behind a Tweepy model. It is already made of
+    plain JSON types, so FastMCP serializes it without walking the model.
+    """
+    return getattr(obj, "data", obj)
+
+def _to_list(objs: Optional[List[Any]]) -> List[Any]:
+    return [_to_dict(obj) for obj in objs or []]
+
+# --- Rate Limiting ---
+MAX_INFLIGHT = max(1, int(os.getenv("TWITTER_MAX_INFLIGHT", "10")))
+# Longest a request waits for a rate-limit window to reset; past it the limit surfaces
+MAX_RETRY_WAIT_SECONDS = 64.0
+
+RATE_LIMIT_REMAINING = Gauge("twitter_rate_limit_remaining", "Requests left in the current Twitter rate-limit window.", ["endpoint"])
+RATE_LIMITED = Counter("twitter_rate_limited_total", "Twitter requests rejected with 429 Too Many Requests.", ["endpoint"])
+INFLIGHT_LIMIT = Gauge("twitter_inflight_limit", "Concurrent Twitter requests currently allowed per endpoint.", ["endpoint"])
+
+class RateLimitExhausted(tweepy.TweepyException):
+    """Raised instead of waiting longer than MAX_RETRY_WAIT_SECONDS for a window to reset."""
+
+class RateLimitSemaphore:
+    """
+    Tracks the remaining request quota of one Twitter API endpoint so concurrent
+    tool calls wait locally for the window to reset instead of running into 429s.
+    A reset further off than MAX_RETRY_WAIT_SECONDS raises RateLimitExhausted.
+
+    The quota starts at `initial` and is replaced by the x-rate-limit-remaining /
+    x-rate-limit-reset values Twitter reports with each response.
+
+    Concurrency is also capped, and the cap adapts AIMD-style: it halves on every
+    429 and grows back by about one per `limit` successful requests, up to
+    `max_inflight`.
+    """
+    def __init__(self, endpoint: str, initial: int = 15, max_inflight: int = MAX_INFLIGHT):
+        self._endpoint = endpoint
+        self._remaining = initial
+        self._reset_at = 0.0
+        self._lock = asyncio.Lock()
+        self._max_inflight = max_inflight
+        self._limit = float(max_inflight)
+        self._inflight = 0
+        self._slot_freed = asyncio.Condition()
+        INFLIGHT_LIMIT.labels(endpoint).set(max_inflight)
+
+    async def __aenter__(self):
+        async with self._slot_freed:
+            await self._slot_freed.wait_for(lambda: self._inflight < int(self._limit))
+            self._inflight += 1
+        try:
+            async with self._lock:
+                while self._remaining < 1:
+                    wait = self._reset_at - time.time()
+                    if wait <= 0:
+                        # The window has reset; let one request through to learn the new quota
+                        self._remaining = 1
+                        break
+                    if wait > MAX_RETRY_WAIT_SECONDS:
+                        # Sleeping out a 15-minute window would also block every other caller
+                        raise RateLimitExhausted(
+                            f"Rate limit for {self._endpoint} is exhausted; it resets in {wait:.0f}s."
+                        )
+                    await asyncio.sleep(wait)
+                self._remaining -= 1
+        except BaseException:
+            await self._release()
+            raise
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        if isinstance(exc, tweepy.TooManyRequests):
+            RATE_LIMITED.labels(self._endpoint).inc()
+            self._limit = max(1.0, self._limit / 2)
+        elif exc is None:
+            self._limit = min(float(self._max_inflight), self._limit + 1 / self._limit)
+        INFLIGHT_LIMIT.labels(self._endpoint).set(int(self._limit))
+        await self._release()
+        return False
+
+    async def _release(self):
+        async with self._slot_freed:
+            self._inflight -= 1
+            self._slot_freed.notify_all()
+
+    def update(self, remaining: int, reset_at: float):
+        """Applies the quota reported by Twitter; `reset_at` is a Unix timestamp."""
+        self._remaining = remaining
+        self._reset_at = reset_at
+        RATE_LIMIT_REMAINING.labels(self._endpoint).set(remaining)
+
+# The limiter of the endpoint whose request is in flight in the current task
+_active_limiter: contextvars.ContextVar[Optional[RateLimitSemaphore]] = contextvars.ContextVar("twitter_active_limiter", default=None)
+
+async def _on_request_end(session, trace_config_ctx, params):
+    """aiohttp trace hook: feeds Twitter's rate-limit headers back into the endpoint's limiter."""
+    limiter = _active_limiter.get()
+    if limiter is None:
+        return
+    remaining = params.response.headers.get("x-rate-limit-remaining")
+    reset_at = params.response.headers.get("x-rate-limit-reset")
+    if remaining is not None and reset_at is not None:
+        limiter.update(int(remaining), float(reset_at))
+
 # --- Twitter API Client Encapsulation ---
+TWITTER_ENV_VARS = (
+    "TWITTER_API_KEY",
+    "TWITTER_API_SECRET",
+    "TWITTER_ACCESS_TOKEN",
+    "TWITTER_ACCESS_TOKEN_SECRET",
+    "TWITTER_BEARER_TOKEN",
+)
+
 class TwitterClient:
     """
     Manages the Tweepy clients, ensuring they are initialized with
@@ -27,284 +158,557 @@ class TwitterClient:
     """
     _v2_client = None
     _v1_api = None
+    _session = None
+    _env: Dict[str, str] = {}
 
     def __init__(self):
+        self._limiters: Dict[str, RateLimitSemaphore] = {}
+        # Kept so register_twitter_tools can refuse to register without credentials;
+        # raising here would break the import of every other social toolset too
+        self.init_error: Optional[EnvironmentError] = None
         try:
             self._initialize_clients()
         except EnvironmentError as e:
-            logger.error(f"Failed to initialize Twitter clients: {e}")
+            self.init_error = e
+            logger.error("Failed to initialize Twitter clients: %s", e)
 
     def _initialize_clients(self):
-        """Initializes both Twitter API v2 and v1.1 clients with detailed logging."""
+        """Initializes the Twitter API v2 client with detailed logging; v1.1 is built lazily by `v1`."""
         logger.info("Attempting to load Twitter API environment variables...")
-        required_env_vars = [
-            "TWITTER_API_KEY",
-            "TWITTER_API_SECRET",
-            "TWITTER_ACCESS_TOKEN",
-            "TWITTER_ACCESS_TOKEN_SECRET",
-            "TWITTER_BEARER_TOKEN",
-        ]
-        
-        missing_vars = []
-        for var in required_env_vars:
-            value = os.getenv(var)
-            if not value:
-                missing_vars.append(var)
-                logger.debug(f"{var}: Missing")
-            else:
-                logger.debug(f"{var}: Found")
+        # Read each variable once; both clients are built from this snapshot
+        env = {var: os.getenv(var) for var in TWITTER_ENV_VARS}
+        for var, value in env.items():
+            logger.debug("%s: %s", var, 'Found' if value else 'Missing')
 
+        missing_vars = [var for var, value in env.items() if not value]
         if missing_vars:
             error_msg = f"Missing one or more required Twitter API environment variables: {', '.join(missing_vars)}."
             logger.error(error_msg)
             raise EnvironmentError(error_msg)
 
         logger.info("All required Twitter API environment variables found. Initializing Tweepy clients...")
+        self._env = env
 
-        self._v2_client = tweepy.Client(
-            consumer_key=os.getenv("TWITTER_API_KEY"),
-            consumer_secret=os.getenv("TWITTER_API_SECRET"),
-            access_token=os.getenv("TWITTER_ACCESS_TOKEN"),
-            access_token_secret=os.getenv("TWITTER_ACCESS_TOKEN_SECRET"),
-            bearer_token=os.getenv("TWITTER_BEARER_TOKEN")
+        # Async client: requests run on the event loop over one shared aiohttp session
+        self._v2_client = AsyncClient(
+            consumer_key=env["TWITTER_API_KEY"],
+            consumer_secret=env["TWITTER_API_SECRET"],
+            access_token=env["TWITTER_ACCESS_TOKEN"],
+            access_token_secret=env["TWITTER_ACCESS_TOKEN_SECRET"],
+            bearer_token=env["TWITTER_BEARER_TOKEN"]
         )
-
-        auth = tweepy.OAuth1UserHandler(
-            consumer_key=os.getenv("TWITTER_API_KEY"),
-            consumer_secret=os.getenv("TWITTER_API_SECRET"),
-            access_token=os.getenv("TWITTER_ACCESS_TOKEN"),
-            access_token_secret=os.getenv("TWITTER_ACCESS_TOKEN_SECRET")
-        )
-        self._v1_api = tweepy.API(auth)
+        # The v1.1 API is built on first use; none of the tools need it
         logger.info("Twitter API clients initialized successfully.")
 
     @property
-    def v2(self) -> tweepy.Client:
+    def v2(self) -> AsyncClient:
         if self._v2_client is None:
-            raise RuntimeError("Twitter v2 client is not initialized.")
+            raise RuntimeError("Twitter v2 client is not initialized. Check logs for API key errors.")
+        if self._session is None or self._session.closed:
+            # Created on first use from a tool, since aiohttp sessions need a running event loop.
+            # Without a session of its own, AsyncClient opens and closes one per request.
+            connector = aiohttp.TCPConnector(limit=100, ttl_dns_cache=300)
+            trace_config = aiohttp.TraceConfig()
+            trace_config.on_request_end.append(_on_request_end)
+            self._session = aiohttp.ClientSession(connector=connector, trace_configs=[trace_config])
+            self._v2_client.session = self._session
         return self._v2_client
 
     @property
     def v1(self) -> tweepy.API:
         if self._v1_api is None:
-            raise RuntimeError("Twitter v1.1 API is not initialized.")
+            if not self._env:
+                raise RuntimeError("Twitter v1.1 API is not initialized. Check logs for API key errors.")
+            auth = tweepy.OAuth1UserHandler(
+                consumer_key=self._env["TWITTER_API_KEY"],
+                consumer_secret=self._env["TWITTER_API_SECRET"],
+                access_token=self._env["TWITTER_ACCESS_TOKEN"],
+                access_token_secret=self._env["TWITTER_ACCESS_TOKEN_SECRET"]
+            )
+            self._v1_api = tweepy.API(auth)
         return self._v1_api
 
+    @contextlib.asynccontextmanager
+    async def rate_limit(self, endpoint: str):
+        """Holds one unit of `endpoint`'s quota for the request made inside the block."""
+        limiter = self._limiters.get(endpoint)
+        if limiter is None:
+            limiter = self._limiters[endpoint] = RateLimitSemaphore(endpoint)
+        async with limiter:
+            token = _active_limiter.set(limiter)
+            try:
+                yield
+            finally:
+                _active_limiter.reset(token)
+
+    async def close(self):
+        """Closes the shared HTTP session used by the v2 client."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+            logger.info("Twitter HTTP session has been closed.")
+
 # Initialize the client globally for the module
 twitter_manager = TwitterClient()
 
-# --- Tool Registration (FastMCP) ---
-def register_twitter_tools(mcp):
+async def close_twitter_client():
+    """Releases the shared Twitter session. Called on MCP server shutdown."""
+    await twitter_manager.close()
+
+# --- Request Helper ---
+_backoff = wait_exponential_jitter(initial=1, max=MAX_RETRY_WAIT_SECONDS)
+
+def _retry_wait(retry_state) -> float:
+    """Waits for the rate-limit window to reset after a 429, else backs off exponentially."""
+    error = retry_state.outcome.exception()
+    if isinstance(error, tweepy.TooManyRequests):
+        reset_at = error.response.headers.get("x-rate-limit-reset")
+        if reset_at:
+            return min(max(0.0, float(reset_at) - time.time()), MAX_RETRY_WAIT_SECONDS)
+    return _backoff(retry_state)
+
+async def _send(endpoint: str, **kwargs) -> Response:
     """
-    Registers all Twitter-related tools with the FastMCP instance.
+    Sends one v2 API request under its endpoint's rate limit, without retrying.
+    Used directly for writes: a 5xx or dropped connection may arrive after
+    Twitter already applied the request, so a retry could post it twice.
+    :param endpoint: The name of the AsyncClient method to call (e.g. 'create_tweet').
     """
-    # This check is not needed as the client initialization handles the failure.
-    # The RuntimeError is now raised if a tool is called without a valid client.
-
-    # --- User Management Tools ---
-    @mcp.tool(name="get_twitter_user_profile", description="Get detailed profile information for a user by their user ID.")
-    async def get_twitter_user_profile(user_id: str) -> Dict[str, Any]:
-        """
-        Fetches user profile by user ID.
-        :param user_id: The ID of the user to look up.
-        """
-        logger.info(f"Tool 'get_twitter_user_profile' called for user_id: {user_id}")
-        try:
-            response: Response = twitter_manager.v2.get_user(
-                id=user_id,
-                user_fields=["id", "name", "username", "profile_image_url", "description", "public_metrics"]
-            )
-            return response.data
-        except Exception as e:
-            logger.error(f"Error getting user profile for user_id {user_id}: {e}")
-            return {"error": "Failed to fetch user profile", "message": str(e)}
-
-    @mcp.tool(name="get_user_by_screen_name", description="Fetches a user by their screen name (username).")
-    async def get_user_by_screen_name(screen_name: str) -> Dict[str, Any]:
-        """
-        Fetches user by screen name.
-        :param screen_name: The screen name/username of the user.
-        """
-        logger.info(f"Tool 'get_user_by_screen_name' called for screen_name: {screen_name}")
-        try:
-            response: Response = twitter_manager.v2.get_user(
-                username=screen_name,
-                user_fields=["id", "name", "username", "profile_image_url", "description", "public_metrics"]
-            )
-            return response.data
-        except Exception as e:
-            logger.error(f"Error getting user by screen name {screen_name}: {e}")
-            return {"error": "Failed to fetch user", "message": str(e)}
-
-    @mcp.tool(name="get_user_by_id", description="Fetches a user by their ID (same as get_twitter_user_profile).")
-    async def get_user_by_id(user_id: str) -> Dict[str, Any]:
-        """
-        Fetches user by ID.
-        :param user_id: The ID of the user to look up.
-        """
-        return await get_twitter_user_profile(user_id)
-
-    @mcp.tool(name="get_user_followers", description="Retrieves a list of followers for a given user.")
-    async def get_user_followers(user_id: str, count: int = 100) -> List[Dict[str, Any]]:
-        """
-        Retrieves a list of followers for a given user.
-        :param user_id: The user ID whose followers are to be retrieved.
-        :param count: The number of followers to retrieve per page. Max 100 for V2 API.
-        """
-        logger.info(f"Tool 'get_user_followers' called for user_id: {user_id}")
-        try:
-            response: Response = twitter_manager.v2.get_users_followers(
-                id=user_id,
-                max_results=min(count, 100),
-                user_fields=["id", "name", "username"]
-            )
-            return response.data or []
-        except Exception as e:
-            logger.error(f"Error getting followers for user_id {user_id}: {e}")
-            return {"error": "Failed to fetch followers", "message": str(e)}
-
-    @mcp.tool(name="get_user_following", description="Retrieves users the given user is following.")
-    async def get_user_following(user_id: str, count: int = 100) -> List[Dict[str, Any]]:
-        """
-        Retrieves a list of users whom the given user is following.
-        :param user_id: The user ID whose following list is to be retrieved.
-        :param count: The number of users to retrieve per page. Max 100 for V2 API.
-        """
-        logger.info(f"Tool 'get_user_following' called for user_id: {user_id}")
-        try:
-            response: Response = twitter_manager.v2.get_users_following(
-                id=user_id,
-                max_results=min(count, 100),
-                user_fields=["id", "name", "username"]
-            )
-            return response.data or []
-        except Exception as e:
-            logger.error(f"Error getting users being followed for user_id {user_id}: {e}")
-            return {"error": "Failed to fetch following list", "message": str(e)}
-
-    # --- Tweet Management Tools ---
-    @mcp.tool(name="post_tweet", description="Post a tweet with optional media and reply information.")
-    async def post_tweet(text: str, reply_to_tweet_id: Optional[str] = None) -> Dict[str, Any]:
-        """
-        Posts a tweet.
-        :param text: The text content of the tweet. Max 280 characters.
-        :param reply_to_tweet_id: The ID of the tweet to reply to.
-        """
-        logger.info(f"Tool 'post_tweet' called with text: '{text[:50]}...'")
-        try:
-            response: Response = twitter_manager.v2.create_tweet(
-                text=text,
-                in_reply_to_tweet_id=reply_to_tweet_id
-            )
-            return response.data
-        except Exception as e:
-            logger.error(f"Error posting tweet: {e}")
-            return {"error": "Failed to post tweet", "message": str(e)}
-
-    @mcp.tool(name="delete_tweet", description="Delete a tweet by its ID.")
-    async def delete_tweet(tweet_id: str) -> Dict[str, Any]:
-        """
-        Deletes a tweet.
-        :param tweet_id: The ID of the tweet to delete.
-        """
-        logger.info(f"Tool 'delete_tweet' called for tweet_id: {tweet_id}")
-        try:
-            response: Response = twitter_manager.v2.delete_tweet(id=tweet_id)
-            return {"id": tweet_id, "deleted": response.data.get("deleted")}
-        except Exception as e:
-            logger.error(f"Error deleting tweet {tweet_id}: {e}")
-            return {"error": "Failed to delete tweet", "message": str(e)}
-
-    @mcp.tool(name="get_tweet_details", description="Get detailed information about a specific tweet.")
-    async def get_tweet_details(tweet_id: str) -> Dict[str, Any]:
-        """
-        Fetches tweet details.
-        :param tweet_id: The ID of the tweet to fetch.
-        """
-        logger.info(f"Tool 'get_tweet_details' called for tweet_id: {tweet_id}")
-        try:
-            response: Response = twitter_manager.v2.get_tweet(
-                id=tweet_id,
-                tweet_fields=["id", "text", "created_at", "author_id", "public_metrics"]
-            )
-            return response.data
-        except Exception as e:
-            logger.error(f"Error getting tweet details for tweet {tweet_id}: {e}")
-            return {"error": "Failed to fetch tweet details", "message": str(e)}
-
-    # --- Timeline & Search Tools ---
-    @mcp.tool(name="fetch_user_tweets", description="Fetches a list of recent tweets from a user's timeline.")
-    async def fetch_user_tweets(user_id: str, count: int = 100) -> List[Dict[str, Any]]:
-        """
-        Fetches a list of recent tweets from a user's timeline.
-        :param user_id: The ID of the user whose tweets are to be retrieved.
-        :param count: Number of tweets to retrieve. Max 100 for V2 API.
-        """
-        logger.info(f"Tool 'fetch_user_tweets' called for user_id: {user_id}")
-        try:
-            response: Response = twitter_manager.v2.get_users_tweets(
-                id=user_id,
-                max_results=min(count, 100),
-                tweet_fields=["id", "text", "created_at", "public_metrics"]
-            )
-            return response.data or []
-        except Exception as e:
-            logger.error(f"Error fetching tweets for user {user_id}: {e}")
-            return {"error": "Failed to fetch user tweets", "message": str(e)}
-
-    @mcp.tool(name="search_twitter", description="Search Twitter for recent tweets matching a query.")
-    async def search_twitter(query: str, count: int = 100) -> List[Dict[str, Any]]:
-        """
-        Searches Twitter for recent tweets.
-        :param query: The search query. Supports operators like #hashtag, from:user, etc.
-        :param count: Number of tweets to retrieve. Min 10, Max 100 for search_recent_tweets.
-        """
-        logger.info(f"Tool 'search_twitter' called with query: '{query}'")
+    async with twitter_manager.rate_limit(endpoint):
+        return await getattr(twitter_manager.v2, endpoint)(**kwargs)
+
+# Reads are idempotent, so rate limits, 5xx responses and network errors are retried
+_call = retry(
+    retry=retry_if_exception_type((tweepy.TooManyRequests, tweepy.TwitterServerError, aiohttp.ClientError)),
+    wait=_retry_wait,
+    stop=stop_after_attempt(5),
+    reraise=True,
+)(_send)
+
+# --- Response Caching ---
+# Profiles and tweets change slowly compared to how often agents re-query them;
+# engagement counts move fastest. A hit costs no request and no rate-limit unit.
+# Full tweets from get_tweet_details also answer engagement-metric lookups.
+_USER_CACHE: TTLCache = TTLCache(maxsize=10_000, ttl=int(os.getenv("TWITTER_USER_CACHE_TTL_SECONDS", "300")))
+_TWEET_CACHE: TTLCache = TTLCache(maxsize=50_000, ttl=int(os.getenv("TWITTER_TWEET_CACHE_TTL_SECONDS", "60")))
+_METRICS_CACHE: TTLCache = TTLCache(maxsize=50_000, ttl=int(os.getenv("TWITTER_METRICS_CACHE_TTL_SECONDS", "30")))
+# Handles almost never change hands, so their IDs are kept for a day
+_USERNAME_TO_ID: TTLCache = TTLCache(maxsize=100_000, ttl=86400)
+_cache_lock = KeyedLocks()
+
+def _cache_user(user):
+    """Caches a user under both its ID and its username."""
+    if user is not None:
+        _USER_CACHE[f"id:{user['id']}"] = user
+        _USER_CACHE[f"username:{user['username'].lower()}"] = user
+        _USERNAME_TO_ID[user["username"].lower()] = str(user["id"])
+
+# --- Pagination ---
+async def _stream(
+    endpoint: str,
+    count: int,
+    *,
+    min_page: int = 1,
+    max_page: int = 100,
+    token_param: str = "pagination_token",
+    **kwargs
+) -> AsyncIterator[Any]:
+    """
+    Yields up to `count` results from a paginated v2 endpoint as each page
+    arrives, following next_token across as many pages as needed.
+    Twitter only reveals the next page's token in the previous response, so the
+    pages are requested back to back; each still goes through `_call`.
+    :param min_page: The smallest max_results the endpoint accepts.
+    :param token_param: The request parameter that carries the next_token.
+    """
+    remaining = count
+    token = None
+    while remaining > 0:
+        page_size = min(max(remaining, min_page), max_page)
+        if token:
+            kwargs[token_param] = token
+        response: Response = await _call(endpoint, max_results=page_size, **kwargs)
+        for item in _to_list(response.data)[:remaining]:
+            yield item
+            remaining -= 1
+        token = (response.meta or {}).get("next_token")
+        if not token:
+            break
+
+# Streaming variants of the list tools, for in-process callers that filter or
+# reduce results and don't need the whole list in memory at once.
+def stream_user_followers(user_id: str, count: int = 100) -> AsyncIterator[Dict[str, Any]]:
+    return _stream("get_users_followers", count, max_page=1000, id=user_id, user_fields=_USER_FIELDS_MIN)
+
+def stream_user_following(user_id: str, count: int = 100) -> AsyncIterator[Dict[str, Any]]:
+    return _stream("get_users_following", count, max_page=1000, id=user_id, user_fields=_USER_FIELDS_MIN)
+
+def stream_user_tweets(user_id: str, count: int = 100) -> AsyncIterator[Dict[str, Any]]:
+    return _stream("get_users_tweets", count, min_page=5, id=user_id, tweet_fields=_TWEET_FIELDS)
+
+def stream_search(query: str, count: int = 100) -> AsyncIterator[Dict[str, Any]]:
+    return _stream(
+        "search_recent_tweets", count, min_page=10, token_param="next_token",
+        query=query, tweet_fields=_TWEET_FIELDS
+    )
+
+def stream_user_mentions(user_id: str, count: int = 100) -> AsyncIterator[Dict[str, Any]]:
+    return _stream("get_users_mentions", count, min_page=5, id=user_id, tweet_fields=_TWEET_FIELDS)
+
+# --- User Lookup Batching ---
+class _UserBatcher:
+    """
+    Collects single-user lookups that arrive within `max_wait` seconds of each
+    other and resolves them with one get_users request (up to 100 users), so a
+    burst of profile lookups costs one round trip and one unit of rate limit.
+    """
+    def __init__(self, key: str, max_wait: float = 0.025, max_batch: int = 100):
+        self._key = key  # The get_users parameter: "ids" or "usernames"
+        self._max_wait = max_wait
+        self._max_batch = max_batch
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._dispatches = set()
+
+    def _match_key(self, value: str) -> str:
+        return value.lower() if self._key == "usernames" else value
+
+    async def lookup(self, value: str) -> Any:
+        """Returns the user for `value`, or None if Twitter doesn't know it."""
+        if self._worker is None or self._worker.done():
+            # Started on first use, since it needs the running event loop
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self._collect_batches())
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((value, future))
+        return await future
+
+    async def _collect_batches(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self._max_wait
+            while len(batch) < self._max_batch:
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), deadline - loop.time()))
+                except asyncio.TimeoutError:
+                    break
+            # Dispatch in the background so the next batch starts collecting right away
+            task = asyncio.create_task(self._dispatch(batch))
+            self._dispatches.add(task)
+            task.add_done_callback(self._dispatches.discard)
+
+    async def _dispatch(self, batch):
+        values = list(dict.fromkeys(value for value, _ in batch))
+        users, errors = await self._fetch(values)
+        for value, future in batch:
+            if future.done():
+                continue
+            key = self._match_key(value)
+            if key in errors:
+                future.set_exception(errors[key])
+            else:
+                future.set_result(users.get(key))
+
+    async def _fetch(self, values: List[str]):
+        """Looks up `values`, returning (users, errors), both keyed by `_match_key`."""
         try:
-            response: Response = twitter_manager.v2.search_recent_tweets(
-                query=query,
-                max_results=min(max(count, 10), 100),
-                tweet_fields=["id", "text", "created_at", "public_metrics"]
+            response: Response = await _call(
+                "get_users",
+                **{self._key: values},
+                user_fields=_USER_FIELDS
             )
-            return response.data or []
-        except Exception as e:
-            logger.error(f"Error searching Twitter for query '{query}': {e}")
-            return {"error": "Failed to perform search", "message": str(e)}
-
-    @mcp.tool(name="get_user_mentions", description="Get tweets mentioning a specific user.")
-    async def get_user_mentions(user_id: str, count: int = 100) -> List[Dict[str, Any]]:
-        """
-        Fetches tweets mentioning a specific user.
-        :param user_id: The ID of the user whose mentions are to be retrieved.
-        :param count: Number of mentions to retrieve. Max 100 for get_users_mentions.
-        """
-        logger.info(f"Tool 'get_user_mentions' called for user_id: {user_id}")
-        try:
-            response: Response = twitter_manager.v2.get_users_mentions(
-                id=user_id,
-                max_results=min(count, 100),
-                tweet_fields=["id", "text", "created_at", "public_metrics"]
+        except tweepy.BadRequest as e:
+            if len(values) == 1:
+                return {}, {self._match_key(values[0]): e}
+            # One malformed value fails the whole request; split the batch to isolate it
+            middle = len(values) // 2
+            (users, errors), (more_users, more_errors) = await asyncio.gather(
+                self._fetch(values[:middle]), self._fetch(values[middle:])
             )
-            return response.data or []
+            return {**users, **more_users}, {**errors, **more_errors}
         except Exception as e:
-            logger.error(f"Error getting mentions for user {user_id}: {e}")
-            return {"error": "Failed to fetch mentions", "message": str(e)}
-
-    @mcp.tool(name="get_tweet_engagement_metrics", description="Get engagement metrics for a specific tweet.")
-    async def get_tweet_engagement_metrics(tweet_id: str) -> Dict[str, Any]:
-        """
-        Gets engagement metrics for a specific tweet.
-        :param tweet_id: The ID of the tweet.
-        """
-        logger.info(f"Tool 'get_tweet_engagement_metrics' called for tweet_id: {tweet_id}")
-        try:
-            response: Response = twitter_manager.v2.get_tweet(
+            return {}, {self._match_key(value): e for value in values}
+
+        field = "username" if self._key == "usernames" else "id"
+        users = {self._match_key(str(user[field])): _to_dict(user) for user in response.data or []}
+        return users, {}
+
+_users_by_id = _UserBatcher("ids")
+_users_by_username = _UserBatcher("usernames")
+
+class UserNotFound(LookupError):
+    """Raised when a screen name doesn't match any Twitter user."""
+
+async def resolve_user_id(handle_or_id: str) -> str:
+    """
+    Returns the numeric user ID for a user ID, a screen name or an @handle.
+    Screen names are looked up once and then served from `_USERNAME_TO_ID`.
+    """
+    if handle_or_id.isdigit():
+        return handle_or_id
+    handle = handle_or_id.lstrip("@")
+    user_id = _USERNAME_TO_ID.get(handle.lower())
+    if user_id is None:
+        user = await _users_by_username.lookup(handle)
+        if user is None:
+            raise UserNotFound(f"Twitter user '{handle}' was not found.")
+        _cache_user(user)
+        user_id = str(user["id"])
+    return user_id
+
+# --- Error Handling ---
+# Failures the tools report back to the agent; anything else is a bug and propagates
+_TWITTER_ERRORS = (tweepy.TweepyException, aiohttp.ClientError)
+_NOT_FOUND_ERRORS = (tweepy.NotFound, UserNotFound)
+
+def twitter_tool(error_message: str):
+    """
+    Converts the Twitter failures raised by a tool into the error dict returned
+    to the agent. Unknown users and tweets come back as {"error": "not_found"};
+    a 429 is re-raised (for reads, once `_call`'s retries are spent).
+
+    :param error_message: The error label returned when the tool fails.
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            try:
+                return await fn(*args, **kwargs)
+            except _NOT_FOUND_ERRORS:
+                return {"error": "not_found"}
+            except tweepy.TooManyRequests:
+                raise
+            except _TWITTER_ERRORS as e:
+                logger.error("Error in %s: %s", fn.__name__, e)
+                return {"error": error_message, "message": str(e)}
+        return wrapper
+    return decorator
+
+# --- User Management ---
+@twitter_tool("Failed to fetch user profile")
+async def get_twitter_user_profile(user_id: str) -> Dict[str, Any]:
+    """
+    Fetches user profile by user ID.
+    :param user_id: The ID (or @handle) of the user to look up.
+    """
+    logger.info("Tool 'get_twitter_user_profile' called for user_id: %s", user_id)
+    user_id = await resolve_user_id(user_id)
+    cache_key = f"id:{user_id}"
+    async with _cache_lock(cache_key):
+        user = _USER_CACHE.get(cache_key)
+        if user is not None:
+            return user
+        user = await _users_by_id.lookup(user_id)
+        _cache_user(user)
+        return user
+
+@twitter_tool("Failed to fetch user")
+async def get_user_by_screen_name(screen_name: str) -> Dict[str, Any]:
+    """
+    Fetches user by screen name.
+    :param screen_name: The screen name/username of the user.
+    """
+    logger.info("Tool 'get_user_by_screen_name' called for screen_name: %s", screen_name)
+    cache_key = f"username:{screen_name.lower()}"
+    async with _cache_lock(cache_key):
+        user = _USER_CACHE.get(cache_key)
+        if user is not None:
+            return user
+        user = await _users_by_username.lookup(screen_name)
+        _cache_user(user)
+        return user
+
+@twitter_tool("Failed to fetch followers")
+async def get_user_followers(user_id: str, count: int = 100) -> List[Dict[str, Any]]:
+    """
+    Retrieves a list of followers for a given user.
+    :param user_id: The user ID (or @handle) whose followers are to be retrieved.
+    :param count: The number of followers to retrieve. More than 1000 are fetched across several pages.
+    """
+    logger.info("Tool 'get_user_followers' called for user_id: %s", user_id)
+    user_id = await resolve_user_id(user_id)
+    return [user async for user in stream_user_followers(user_id, count)]
+
+@twitter_tool("Failed to fetch following list")
+async def get_user_following(user_id: str, count: int = 100) -> List[Dict[str, Any]]:
+    """
+    Retrieves a list of users whom the given user is following.
+    :param user_id: The user ID (or @handle) whose following list is to be retrieved.
+    :param count: The number of users to retrieve. More than 1000 are fetched across several pages.
+    """
+    logger.info("Tool 'get_user_following' called for user_id: %s", user_id)
+    user_id = await resolve_user_id(user_id)
+    return [user async for user in stream_user_following(user_id, count)]
+
+# --- Tweet Management ---
+@twitter_tool("Failed to post tweet")
+async def post_tweet(text: str, reply_to_tweet_id: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Posts a tweet.
+    :param text: The text content of the tweet. Max 280 characters.
+    :param reply_to_tweet_id: The ID of the tweet to reply to.
+    """
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Tool 'post_tweet' called with text: '%s...'", text[:50])
+    response: Response = await _send(
+        "create_tweet",
+        text=text,
+        in_reply_to_tweet_id=reply_to_tweet_id
+    )
+    return response.data
+
+@twitter_tool("Failed to delete tweet")
+async def delete_tweet(tweet_id: str) -> Dict[str, Any]:
+    """
+    Deletes a tweet.
+    :param tweet_id: The ID of the tweet to delete.
+    """
+    logger.info("Tool 'delete_tweet' called for tweet_id: %s", tweet_id)
+    response: Response = await _send("delete_tweet", id=tweet_id)
+    return {"id": tweet_id, "deleted": response.data.get("deleted")}
+
+@twitter_tool("Failed to delete tweets")
+async def delete_tweets(tweet_ids: List[str]) -> List[Dict[str, Any]]:
+    """
+    Deletes several tweets concurrently.
+    The endpoint's rate limiter bounds how many deletes are in flight; a tweet
+    that fails gets an error entry without discarding the others.
+    :param tweet_ids: The IDs of the tweets to delete.
+    """
+    logger.info("Tool 'delete_tweets' called for %s tweets", len(tweet_ids))
+
+    async def _delete(tweet_id: str) -> Dict[str, Any]:
+        response: Response = await _send("delete_tweet", id=tweet_id)
+        return {"id": tweet_id, "deleted": response.data.get("deleted")}
+
+    results = await asyncio.gather(*(_delete(tweet_id) for tweet_id in tweet_ids), return_exceptions=True)
+    batch = []
+    for tweet_id, result in zip(tweet_ids, results):
+        if isinstance(result, _NOT_FOUND_ERRORS):
+            batch.append({"id": tweet_id, "error": "not_found"})
+        elif isinstance(result, _TWITTER_ERRORS):
+            logger.error("Error deleting tweet %s: %s", tweet_id, result)
+            batch.append({"id": tweet_id, "error": "Failed to delete tweet", "message": str(result)})
+        elif isinstance(result, BaseException):
+            raise result
+        else:
+            batch.append(result)
+    return batch
+
+@twitter_tool("Failed to fetch tweet details")
+async def get_tweet_details(tweet_id: str) -> Dict[str, Any]:
+    """
+    Fetches tweet details.
+    :param tweet_id: The ID of the tweet to fetch.
+    """
+    logger.info("Tool 'get_tweet_details' called for tweet_id: %s", tweet_id)
+    async with _cache_lock(f"tweet:{tweet_id}"):
+        tweet = _TWEET_CACHE.get(tweet_id)
+        if tweet is not None:
+            return tweet
+        response: Response = await _call(
+            "get_tweet",
+            id=tweet_id,
+            tweet_fields=_TWEET_FIELDS_FULL
+        )
+        tweet = _to_dict(response.data)
+        if tweet is not None:
+            _TWEET_CACHE[tweet_id] = tweet
+            if tweet.get("public_metrics"):
+                _METRICS_CACHE[tweet_id] = tweet["public_metrics"]
+        return tweet
+
+# --- Timeline & Search ---
+@twitter_tool("Failed to fetch user tweets")
+async def fetch_user_tweets(user_id: str, count: int = 100) -> List[Dict[str, Any]]:
+    """
+    Fetches a list of recent tweets from a user's timeline.
+    :param user_id: The ID (or @handle) of the user whose tweets are to be retrieved.
+    :param count: Number of tweets to retrieve. More than 100 are fetched across several pages.
+    """
+    logger.info("Tool 'fetch_user_tweets' called for user_id: %s", user_id)
+    user_id = await resolve_user_id(user_id)
+    return [tweet async for tweet in stream_user_tweets(user_id, count)]
+
+@twitter_tool("Failed to perform search")
+async def search_twitter(query: str, count: int = 100) -> List[Dict[str, Any]]:
+    """
+    Searches Twitter for recent tweets.
+    :param query: The search query. Supports operators like #hashtag, from:user, etc.
+    :param count: Number of tweets to retrieve. More than 100 are fetched across several pages.
+    """
+    logger.info("Tool 'search_twitter' called with query: '%s'", query)
+    return [tweet async for tweet in stream_search(query, count)]
+
+@twitter_tool("Failed to fetch mentions")
+async def get_user_mentions(user_id: str, count: int = 100) -> List[Dict[str, Any]]:
+    """
+    Fetches tweets mentioning a specific user.
+    :param user_id: The ID (or @handle) of the user whose mentions are to be retrieved.
+    :param count: Number of mentions to retrieve. More than 100 are fetched across several pages.
+    """
+    logger.info("Tool 'get_user_mentions' called for user_id: %s", user_id)
+    user_id = await resolve_user_id(user_id)
+    return [tweet async for tweet in stream_user_mentions(user_id, count)]
+
+@twitter_tool("Failed to get metrics")
+async def get_tweet_engagement_metrics(tweet_id: str) -> Dict[str, Any]:
+    """
+    Gets engagement metrics for a specific tweet.
+    :param tweet_id: The ID of the tweet.
+    """
+    logger.info("Tool 'get_tweet_engagement_metrics' called for tweet_id: %s", tweet_id)
+    async with _cache_lock(f"metrics:{tweet_id}"):
+        metrics = _METRICS_CACHE.get(tweet_id)
+        if metrics is not None:
+            return metrics
+        # A recent get_tweet_details already carries the metrics
+        metrics = (_TWEET_CACHE.get(tweet_id) or {}).get("public_metrics")
+        if metrics is None:
+            response: Response = await _call(
+                "get_tweet",
                 id=tweet_id,
-                tweet_fields=["public_metrics"]
+                tweet_fields=_METRICS_ONLY
             )
-            if response.data and response.data.public_metrics:
-                return response.data.public_metrics
-            return {"message": "No public metrics available for this tweet."}
-        except Exception as e:
-            logger.error(f"Error getting engagement metrics for tweet {tweet_id}: {e}")
-            return {"error": "Failed to get metrics", "message": str(e)}
+            metrics = (_to_dict(response.data) or {}).get("public_metrics")
+        if metrics:
+            _METRICS_CACHE[tweet_id] = metrics
+            return metrics
+        return {"message": "No public metrics available for this tweet."}
+
+_TOOLS = [
+    (get_twitter_user_profile, "get_twitter_user_profile", "Get detailed profile information for a user by their user ID."),
+    (get_twitter_user_profile, "get_user_by_id", "Fetches a user by their ID (same as get_twitter_user_profile)."),
+    (get_user_by_screen_name, "get_user_by_screen_name", "Fetches a user by their screen name (username)."),
+    (get_user_followers, "get_user_followers", "Retrieves a list of followers for a given user."),
+    (get_user_following, "get_user_following", "Retrieves users the given user is following."),
+    (post_tweet, "post_tweet", "Post a tweet with optional media and reply information."),
+    (delete_tweet, "delete_tweet", "Delete a tweet by its ID."),
+    (delete_tweets, "delete_tweets", "Delete several tweets by their IDs, concurrently."),
+    (get_tweet_details, "get_tweet_details", "Get detailed information about a specific tweet."),
+    (fetch_user_tweets, "fetch_user_tweets", "Fetches a list of recent tweets from a user's timeline."),
+    (search_twitter, "search_twitter", "Search Twitter for recent tweets matching a query."),
+    (get_user_mentions, "get_user_mentions", "Get tweets mentioning a specific user."),
+    (get_tweet_engagement_metrics, "get_tweet_engagement_metrics", "Get engagement metrics for a specific tweet."),
+]
+
+# --- Tool Registration (FastMCP) ---
+def register_twitter_tools(mcp):
+    """
+    Registers all Twitter-related tools with the FastMCP instance.
+
+    The tools are module-level functions listed in `_TOOLS`; error handling,
+    caching and rate limiting are shared by all of them through `twitter_tool`
+    and `_call`. get_user_by_id is registered on the same function as
+    get_twitter_user_profile.
+    """
+    # Missing credentials fail the registration rather than every tool call.
+    # Set TWITTER_ALLOW_MISSING=1 for local runs without Twitter keys.
+    if twitter_manager.init_error is not None:
+        if os.getenv("TWITTER_ALLOW_MISSING", "false").lower() not in ("1", "true", "yes"):
+            raise twitter_manager.init_error
+        logger.warning("Registering Twitter tools without credentials (TWITTER_ALLOW_MISSING is set).")
+
+    for fn, name, description in _TOOLS:
+        mcp.tool(name=name, description=description)(fn)